@@ -0,0 +1,180 @@
+"""
+Build-time CSS pipeline for the form pages.
+
+    python assets.py                      # static/ -> static/dist/
+    python assets.py --source static --output static/dist
+
+Bundles (BUNDLES) and every other css/*.css file are minified and written
+as content-hashed files (css/irs_forms.3f9c1a2b7d4e.css) plus a
+manifest.json mapping logical names to hashed paths. A hashed file never
+changes, so serve static/dist/ with
+"Cache-Control: public, max-age=31536000, immutable".
+
+Templates use {% bundle_url 'irs_forms' %} and {% inline_static 'css/x.css' %}
+from the form_assets tag library.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+
+BUNDLES = {
+    "irs_forms": ["css/irs_form_common.css", "css/irs_form_header.css", "css/irs_form_footer.css"],
+    "forms": ["css/forms.css"],
+}
+
+MANIFEST_NAME = "manifest.json"
+DIST_DIR = "dist"
+HASH_LENGTH = 12
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.S)
+_WHITESPACE = re.compile(r"\s+")
+_AROUND_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_AFTER_COLON = re.compile(r":\s+")
+
+
+def minify_css(css):
+    """Drop comments and redundant whitespace (no selector or value rewriting)."""
+    css = _COMMENTS.sub("", css)
+    css = _WHITESPACE.sub(" ", css)
+    css = _AROUND_PUNCTUATION.sub(r"\1", css)
+    css = _AFTER_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _hashed_name(logical_name, content):
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    base, ext = os.path.splitext(logical_name)
+    return f"{base}.{digest}{ext}"
+
+
+def build_assets(source_dir, output_dir):
+    """
+    Minify + hash every bundle and standalone stylesheet into output_dir.
+
+    Returns the manifest: logical name ("irs_forms", "css/1040.css") -> hashed
+    path relative to output_dir.
+    """
+    manifest = {}
+    bundled = set()
+
+    def write(logical_name, content):
+        hashed = _hashed_name(logical_name, content)
+        path = os.path.join(output_dir, hashed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        manifest[logical_name] = hashed.replace(os.sep, "/")
+
+    for name, files in BUNDLES.items():
+        content = "\n".join(minify_css(_read(os.path.join(source_dir, file_name))) for file_name in files)
+        write(f"css/{name}.css", content)
+        manifest[name] = manifest.pop(f"css/{name}.css")
+        bundled.update(files)
+
+    css_dir = os.path.join(source_dir, "css")
+    for file_name in sorted(os.listdir(css_dir)) if os.path.isdir(css_dir) else []:
+        logical_name = f"css/{file_name}"
+        if file_name.endswith(".css") and logical_name not in bundled:
+            write(logical_name, minify_css(_read(os.path.join(css_dir, file_name))))
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+# ===== Runtime (Django) =====
+
+_manifest = None
+_inline_cache = {}
+_lock = threading.Lock()
+
+
+def _source_dir():
+    from django.conf import settings
+
+    return getattr(settings, "ASSETS_SOURCE_DIR", os.path.join(settings.BASE_DIR, "static"))
+
+
+def _output_dir():
+    return os.path.join(_source_dir(), DIST_DIR)
+
+
+def get_manifest():
+    """Built manifest; rebuilt on first use in DEBUG, required in production."""
+    global _manifest
+    if _manifest is None:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+
+        with _lock:
+            if _manifest is None:
+                path = os.path.join(_output_dir(), MANIFEST_NAME)
+                if settings.DEBUG:
+                    _manifest = build_assets(_source_dir(), _output_dir())
+                elif os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        _manifest = json.load(f)
+                else:
+                    raise ImproperlyConfigured(f"{path} is missing - run `python assets.py` before collectstatic")
+    return _manifest
+
+
+def asset_path(name):
+    """
+    Static path of the hashed file for a bundle or stylesheet (for {% static %}).
+
+    A stylesheet missing from static/css when the manifest was built keeps
+    its unhashed path, as a plain {% static %} link would.
+    """
+    hashed = get_manifest().get(name)
+    if hashed is None:
+        if name in BUNDLES:
+            raise KeyError(f"Bundle {name!r} is missing from the asset manifest - rebuild it with `python assets.py`")
+        return name
+    return f"{DIST_DIR}/{hashed}"
+
+
+def inline_css(path):
+    """
+    Minified content of a stylesheet, read from disk once per process
+    (re-read when the file changes in DEBUG).
+    """
+    from django.conf import settings
+    from django.contrib.staticfiles import finders
+
+    cached = _inline_cache.get(path)
+    if cached is not None and not settings.DEBUG:
+        return cached[1]
+
+    full_path = finders.find(path) or os.path.join(_source_dir(), path)
+    mtime = os.stat(full_path).st_mtime
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    content = minify_css(_read(full_path))
+    _inline_cache[path] = (mtime, content)
+    return content
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle, minify and hash the form stylesheets")
+    parser.add_argument("--source", default="static", help="Static source directory")
+    parser.add_argument("--output", help="Output directory (default: <source>/dist)")
+    args = parser.parse_args(argv)
+
+    manifest = build_assets(args.source, args.output or os.path.join(args.source, DIST_DIR))
+    for name, hashed in sorted(manifest.items()):
+        print(f"{name} -> {hashed}")
+
+
+if __name__ == "__main__":
+    main()
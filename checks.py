@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+@register(Tags.templates)
+def check_cached_template_loader(app_configs, **kwargs):
+    """
+    Production must use the cached template loader: without it every form
+    render re-reads and re-compiles its template and all of its includes.
+
+    Registered when this module is imported (views.py imports it).
+    """
+    if settings.DEBUG:
+        return []
+
+    errors = []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        if not any(isinstance(loader, CachedLoader) for loader in backend.engine.template_loaders):
+            errors.append(
+                Error(
+                    f"Template engine '{backend.name}' does not use the cached template loader.",
+                    hint=(
+                        "Remove the explicit 'loaders' option (Django wraps the default loaders in "
+                        "django.template.loaders.cached.Loader) or list the cached loader first."
+                    ),
+                    id="forms.E001",
+                )
+            )
+    return errors
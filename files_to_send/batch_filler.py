@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Bulk Batch Filler for the PDF Filler
+Re-renders many filled PDFs at once (new IRS templates, changed mappings)
+
+ARCHITECTURE:
+- Input: Iterator of (form_name, data) jobs (same data shape as fill_form_universal)
+- Process: Fans jobs out to a ProcessPoolExecutor. Each worker compiles the
+  template indexes and fill plans ONCE when it starts, then only fills.
+- Output: PDFs streamed to a sink (output directory or Django storage) plus
+  a BatchReport with throughput, per-form latency percentiles and failures
+
+Jobs are submitted through a bounded window, so a generator over millions
+of returns is never fully materialized in memory.
+
+USAGE (command line):
+    python batch_filler.py jobs.jsonl output_dir --workers 8 --report report.json
+
+    jobs.jsonl has one job per line: {"form_name": "1040", "data": {...}}
+
+USAGE (Django management command):
+    from your_app.batch_filler import DirectorySink, run_batch
+
+    class Command(BaseCommand):
+        def handle(self, *args, **options):
+            jobs = ((FORM_ID_TO_TEMPLATE[f.id][0], f.data) for f in Form.objects.iterator())
+            report = run_batch(jobs, DirectorySink('/srv/pdfs'))
+            self.stdout.write(report.summary())
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from .pdf_filler import fill_form_universal, get_fill_plan
+    from .form_mappings_complete import FORM_TEMPLATES
+except ImportError:
+    # Standalone mode (not in Django)
+    from pdf_filler import fill_form_universal, get_fill_plan
+    from form_mappings_complete import FORM_TEMPLATES
+
+# One finished job
+#   job_number: 0-based position in the job iterator
+#   form_name:  form identifier
+#   latency:    seconds spent filling inside the worker
+#   size:       output size in bytes (0 on failure)
+#   location:   where the sink stored the PDF (None on failure)
+#   error:      "ExceptionType: message" on failure, else None
+BatchResult = namedtuple('BatchResult', 'job_number form_name latency size location error')
+
+
+# ===== SINKS =====
+
+class DirectorySink:
+    """Write each PDF to <output_dir>/<job_number>_<form_name>.pdf"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __call__(self, job_number, form_name, pdf_bytes):
+        path = os.path.join(self.output_dir, f"{job_number:07d}_{form_name}.pdf")
+        with open(path, 'wb') as f:
+            f.write(pdf_bytes)
+        return path
+
+
+class StorageSink:
+    """Save each PDF through a Django storage backend (default_storage, S3...)"""
+
+    def __init__(self, storage, prefix='filled_pdfs'):
+        self.storage = storage
+        self.prefix = prefix
+
+    def __call__(self, job_number, form_name, pdf_bytes):
+        from django.core.files.base import ContentFile
+
+        name = f"{self.prefix}/{job_number:07d}_{form_name}.pdf"
+        return self.storage.save(name, ContentFile(pdf_bytes))
+
+
+# ===== WORKERS =====
+
+def _init_worker(form_names):
+    """Preload template indexes and fill plans once per worker process"""
+    for form_name in form_names:
+        try:
+            get_fill_plan(form_name)
+        except (ValueError, FileNotFoundError):
+            # Reported by the jobs of that form (an initializer error breaks the whole pool)
+            pass
+
+
+def _fill_job(job_number, form_name, data, grey_out_calculated):
+    """Runs in a worker: returns (job_number, form_name, latency, pdf_bytes, error)"""
+    started = time.perf_counter()
+    try:
+        pdf_bytes = fill_form_universal(data, form_name, grey_out_calculated)
+    except Exception as e:
+        return job_number, form_name, time.perf_counter() - started, None, f"{type(e).__name__}: {e}"
+    return job_number, form_name, time.perf_counter() - started, pdf_bytes, None
+
+
+# ===== REPORT =====
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class BatchReport:
+    """
+    Outcome of one run_batch() call
+
+    Attributes:
+        results (list): BatchResult per job, in completion order
+        elapsed (float): Wall-clock seconds for the whole batch
+        workers (int): Number of worker processes
+    """
+
+    def __init__(self, results, elapsed, workers):
+        self.results = results
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def failures(self):
+        return [r for r in self.results if r.error]
+
+    @property
+    def throughput(self):
+        """Successful PDFs per second (wall clock)"""
+        succeeded = len(self.results) - len(self.failures)
+        return succeeded / self.elapsed if self.elapsed else 0.0
+
+    def per_form(self):
+        """form_name → {count, failed, p50, p90, p99, max, bytes} (latencies in ms)"""
+        grouped = {}
+        for result in self.results:
+            grouped.setdefault(result.form_name, []).append(result)
+
+        stats = {}
+        for form_name, results in sorted(grouped.items()):
+            latencies = sorted(r.latency * 1000 for r in results if not r.error)
+            stats[form_name] = {
+                'count': len(results),
+                'failed': sum(1 for r in results if r.error),
+                'p50': round(percentile(latencies, 50), 2),
+                'p90': round(percentile(latencies, 90), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2) if latencies else 0.0,
+                'bytes': sum(r.size for r in results),
+            }
+        return stats
+
+    def to_dict(self):
+        return {
+            'jobs': len(self.results),
+            'failed': len(self.failures),
+            'workers': self.workers,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'pdfs_per_second': round(self.throughput, 2),
+            'forms': self.per_form(),
+            'failures': [
+                {'job_number': r.job_number, 'form_name': r.form_name, 'error': r.error}
+                for r in self.failures
+            ],
+        }
+
+    def summary(self):
+        lines = [
+            f"✅ Filled {len(self.results) - len(self.failures)}/{len(self.results)} PDFs "
+            f"in {self.elapsed:.1f}s ({self.throughput:.1f}/s, {self.workers} workers)"
+        ]
+        for form_name, stats in self.per_form().items():
+            lines.append(
+                f"   {form_name}: {stats['count']} PDFs, "
+                f"p50 {stats['p50']}ms, p90 {stats['p90']}ms, p99 {stats['p99']}ms"
+            )
+        if self.failures:
+            lines.append(f"   ⚠️  {len(self.failures)} failed")
+        return '\n'.join(lines)
+
+
+# ===== BATCH =====
+
+def run_batch(jobs, sink, workers=None, form_names=None, grey_out_calculated=True, max_pending=None):
+    """
+    Fill every job in a process pool and hand each PDF to the sink
+
+    Args:
+        jobs: Iterable of (form_name, data) tuples
+        sink: Callable(job_number, form_name, pdf_bytes) → location
+            (DirectorySink, StorageSink or your own)
+        workers (int): Worker processes (default: os.cpu_count())
+        form_names (list): Forms to preload in each worker (default: all of FORM_TEMPLATES)
+        grey_out_calculated (bool): Passed to fill_form_universal
+        max_pending (int): Jobs in flight at once (default: 4 per worker)
+
+    Returns:
+        BatchReport
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    form_names = list(form_names or FORM_TEMPLATES)
+
+    results = []
+    started = time.perf_counter()
+    submitted = {}  # future → (job_number, form_name)
+
+    def collect(future):
+        try:
+            job_number, form_name, latency, pdf_bytes, error = future.result()
+        except BrokenProcessPool as e:
+            # A worker died (killed, out of memory): its job and every job still queued fail
+            job_number, form_name = submitted[future]
+            latency, pdf_bytes, error = 0.0, None, f"{type(e).__name__}: {e}"
+        del submitted[future]
+        if error:
+            results.append(BatchResult(job_number, form_name, latency, 0, None, error))
+            return
+        try:
+            location = sink(job_number, form_name, pdf_bytes)
+        except Exception as e:
+            results.append(BatchResult(job_number, form_name, latency, 0, None, f"{type(e).__name__}: {e}"))
+            return
+        results.append(BatchResult(job_number, form_name, latency, len(pdf_bytes), location, None))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(form_names,)) as pool:
+        pending = set()
+        for job_number, (form_name, data) in enumerate(jobs):
+            try:
+                future = pool.submit(_fill_job, job_number, form_name, data, grey_out_calculated)
+            except BrokenProcessPool as e:
+                results.append(BatchResult(job_number, form_name, 0.0, 0, None, f"{type(e).__name__}: {e}"))
+                continue
+            submitted[future] = (job_number, form_name)
+            pending.add(future)
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+
+        for future in wait(pending).done:
+            collect(future)
+
+    return BatchReport(results, time.perf_counter() - started, workers)
+
+
+def _read_jobs(path):
+    """Yield (form_name, data) from a JSON Lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                job = json.loads(line)
+                yield job['form_name'], job['data']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-render filled PDFs in bulk")
+    parser.add_argument('jobs', help="JSON Lines file: {\"form_name\": ..., \"data\": ...} per line")
+    parser.add_argument('output_dir', help="Directory for the filled PDFs")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--report', help="Write the JSON report to this file")
+    parser.add_argument('--no-grey', action='store_true', help="Do not grey out calculated fields")
+    args = parser.parse_args(argv)
+
+    report = run_batch(
+        _read_jobs(args.jobs),
+        DirectorySink(args.output_dir),
+        workers=args.workers,
+        grey_out_calculated=not args.no_grey,
+    )
+
+    print(report.summary())
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the PDF Filler
+Reproducible cold/warm fill benchmarks across every form in ALL_FORM_MAPPINGS
+
+ARCHITECTURE:
+- Input: Synthetic data per form - EVERY mapped line item filled (half of
+  them can_be_modified: false), every taxpayer field set, checkboxes
+  toggled on/off alternately, the first filing status selected
+- Process: Each form runs in a FRESH process, so "cold" really is the
+  first fill after start-up (plan compile, template load) and peak RSS
+  belongs to that form alone. Then `iterations` warm fills are timed.
+- Output: JSON report (per form: cold ms, warm p50/p90/max ms, fills per
+  second per core, peak RSS, output size, phase breakdown) that can be
+  diffed between releases with --compare
+- Output profiles (--profiles): per form and profile, the output size and
+  the serialize / CPU time per fill, to pick a size/CPU trade-off - plus
+  the flattened (print mode) size, which must not exceed the editable one
+  (the run fails when it does)
+
+USAGE:
+    python benchmark_filler.py --output bench.json
+    python benchmark_filler.py --forms 1040 schedule_a --iterations 50
+    python benchmark_filler.py --output new.json --compare old.json
+    python benchmark_filler.py --profiles default compact small archive
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from .form_mappings_complete import ALL_FORM_MAPPINGS, FORM_TEMPLATES
+    from .batch_filler import percentile
+except ImportError:
+    # Standalone mode (not in Django)
+    from form_mappings_complete import ALL_FORM_MAPPINGS, FORM_TEMPLATES
+    from batch_filler import percentile
+
+# Bump when the report layout changes
+REPORT_VERSION = 3
+
+
+def synthetic_data(form_name):
+    """
+    Data that exercises every mapping of a form
+
+    Line item values are distinct numbers (so a misrouted field is visible
+    when the output is opened), every second one is a calculated field.
+    """
+    try:
+        from .pdf_filler import CHECKBOX_MAPPINGS, TAXPAYER_MAPPINGS
+    except ImportError:
+        from pdf_filler import CHECKBOX_MAPPINGS, TAXPAYER_MAPPINGS
+
+    fields = {}
+    for i, json_field in enumerate(ALL_FORM_MAPPINGS[form_name]):
+        fields[json_field] = {
+            'value': str(1000 + i),
+            'can_be_modified': i % 2 == 0,
+        }
+
+    taxpayer = {
+        'first_name': 'Jordan',
+        'last_name': 'Sample',
+        'ssn': '123-45-6789',
+        'address': '100 Main St',
+        'city': 'Springfield',
+        'state': 'IL',
+        'zip': '62701',
+    }
+    for json_field in TAXPAYER_MAPPINGS.get(form_name, {}):
+        taxpayer.setdefault(json_field, f"{json_field} value")
+
+    for i, (json_field, pdf_field) in enumerate(CHECKBOX_MAPPINGS.get(form_name, {}).items()):
+        if isinstance(pdf_field, dict):
+            # Multi-option (filing status): pick the first option
+            status = next(iter(pdf_field))
+            taxpayer['status_display'] = status.replace('_', ' ').title()
+        else:
+            taxpayer[json_field] = i % 2 == 0
+
+    return {'taxpayer': taxpayer, 'fields': fields}
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _bench_profiles(form_name, data, iterations, fill_options, profiles):
+    """Output size and serialize/CPU cost of each output profile"""
+    try:
+        from .pdf_filler import fill_form_universal
+    except ImportError:
+        from pdf_filler import fill_form_universal
+
+    results = {}
+    for profile in profiles:
+        options = dict(fill_options, output_profile=profile)
+        serialize = 0.0
+        started_cpu = time.process_time()
+        for _ in range(iterations):
+            pdf_bytes, report = fill_form_universal(data, form_name, with_report=True, **options)
+            serialize += report.timings.get('serialize', 0.0)
+        cpu = time.process_time() - started_cpu
+        flattened = fill_form_universal(data, form_name, **dict(options, flatten=True))
+        results[profile] = {
+            'output_bytes': len(pdf_bytes),
+            'flattened_bytes': len(flattened),
+            'serialize_ms': round(serialize / iterations * 1000, 3),
+            'cpu_ms': round(cpu / iterations * 1000, 3),
+        }
+    return results
+
+
+def _bench_form(form_name, iterations, fill_options, profiles=()):
+    """Runs in a fresh process: returns the result dict for one form"""
+    try:
+        from .pdf_filler import fill_form_universal
+    except ImportError:
+        from pdf_filler import fill_form_universal
+
+    data = synthetic_data(form_name)
+
+    started = time.perf_counter()
+    pdf_bytes, cold_report = fill_form_universal(data, form_name, with_report=True, **fill_options)
+    cold = time.perf_counter() - started
+
+    warm = []
+    phases = {}
+    for _ in range(iterations):
+        started = time.perf_counter()
+        pdf_bytes, report = fill_form_universal(data, form_name, with_report=True, **fill_options)
+        warm.append(time.perf_counter() - started)
+        for phase, seconds in report.timings.items():
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    warm_ms = sorted(seconds * 1000 for seconds in warm)
+    mean = statistics.mean(warm) if warm else cold
+    return {
+        'cold_ms': round(cold * 1000, 2),
+        'warm_p50_ms': round(percentile(warm_ms, 50), 2) if warm_ms else None,
+        'warm_p90_ms': round(percentile(warm_ms, 90), 2) if warm_ms else None,
+        'warm_max_ms': round(warm_ms[-1], 2) if warm_ms else None,
+        'fills_per_second_per_core': round(1 / mean, 1) if mean else None,
+        'phases_ms': {phase: round(seconds / iterations * 1000, 3) for phase, seconds in phases.items()} if iterations else {},
+        'peak_rss_bytes': _peak_rss_bytes(),
+        'output_bytes': len(pdf_bytes),
+        'filled': cold_report.filled,
+        'skipped': len(cold_report.skipped),
+        'profiles': _bench_profiles(form_name, data, max(iterations, 1), fill_options, profiles) if profiles else {},
+    }
+
+
+def run_benchmark(form_names=None, iterations=20, fill_options=None, profiles=()):
+    """
+    Benchmark forms, each in its own fresh process
+
+    Args:
+        form_names (list): Forms to run (default: every form in ALL_FORM_MAPPINGS)
+        iterations (int): Warm fills per form
+        fill_options (dict): Extra fill_form_universal() keyword arguments
+        profiles (list): Output profiles to measure (see output_profiles.py)
+
+    Returns:
+        dict: JSON-serializable report
+    """
+    import fitz  # PyMuPDF
+
+    form_names = list(form_names or [f for f in FORM_TEMPLATES if f in ALL_FORM_MAPPINGS])
+    fill_options = fill_options or {}
+
+    forms = {}
+    for form_name in form_names:
+        # A new single-worker pool per form = a cold process per form
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            try:
+                forms[form_name] = pool.submit(_bench_form, form_name, iterations, fill_options, profiles).result()
+            except Exception as e:
+                forms[form_name] = {'error': f"{type(e).__name__}: {e}"}
+        print(f"   {form_name}: {forms[form_name]}")
+
+    return {
+        'version': REPORT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pymupdf': fitz.VersionBind,
+        'machine': platform.machine(),
+        'iterations': iterations,
+        'fill_options': fill_options,
+        'profiles': list(profiles),
+        'forms': forms,
+    }
+
+
+def compare_reports(old, new, metric='warm_p50_ms'):
+    """Lines describing the change of one metric per form (old → new)"""
+    lines = []
+    for form_name, result in new['forms'].items():
+        before = old.get('forms', {}).get(form_name, {}).get(metric)
+        after = result.get(metric)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        lines.append(f"   {form_name}: {before} → {after} ({change:+.1f}%)")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PDF filler across all forms")
+    parser.add_argument('--forms', nargs='*', help="Forms to run (default: all)")
+    parser.add_argument('--iterations', type=int, default=20, help="Warm fills per form")
+    parser.add_argument('--need-appearances', action='store_true', help="Benchmark the NeedAppearances mode")
+    parser.add_argument('--profiles', nargs='*', default=[], help="Output profiles to measure (size vs. CPU)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Previous JSON report to diff warm p50 against")
+    args = parser.parse_args(argv)
+
+    fill_options = {'need_appearances': True} if args.need_appearances else {}
+    report = run_benchmark(args.forms, args.iterations, fill_options, args.profiles)
+
+    failed = [form_name for form_name, result in report['forms'].items() if 'error' in result]
+    print(f"✅ Benchmarked {len(report['forms']) - len(failed)} forms ({args.iterations} warm fills each)")
+    if failed:
+        print(f"   ⚠️  {len(failed)} forms failed: {', '.join(failed)}")
+
+    for profile in args.profiles:
+        measured = [result['profiles'][profile] for result in report['forms'].values() if 'error' not in result]
+        total_bytes = sum(m['output_bytes'] for m in measured)
+        cpu_ms = sum(m['cpu_ms'] for m in measured)
+        print(f"   📦 {profile}: {total_bytes:,} bytes for all forms, {cpu_ms:.1f}ms CPU per full set")
+
+        grown = [
+            f"{form_name} ({result['profiles'][profile]['output_bytes']:,} → {result['profiles'][profile]['flattened_bytes']:,})"
+            for form_name, result in report['forms'].items()
+            if 'error' not in result
+            and result['profiles'][profile]['flattened_bytes'] > result['profiles'][profile]['output_bytes']
+        ]
+        if grown:
+            failed.extend(grown)
+            print(f"   ⚠️  {profile}: flattening made {len(grown)} forms larger: {', '.join(grown)}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        print("Warm p50 (ms), previous → current:")
+        print('\n'.join(compare_reports(old, report)))
+        print("Output size (bytes), previous → current:")
+        print('\n'.join(compare_reports(old, report, 'output_bytes')))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Fill Plan Compiler for the PDF Filler
+Turns the JSON → PDF mapping dicts into a flat list of resolved write operations
+
+ARCHITECTURE:
+- Input: ALL_FORM_MAPPINGS[form], *_TAXPAYER_INFO, *_CHECKBOXES + the template's TemplateIndex
+- Process: Interprets every mapping ONCE (dict vs str checkbox, combined
+  'full_name' / 'property_address_1a' keys, empty or ambiguous names) and
+  resolves it to a widget slot (page, xref, on-state)
+- Output: FillPlan - ordered FillOps that fill_form_universal runs in a tight loop
+
+Operation order matches the original filler (line items → taxpayer info →
+checkboxes), so when two mappings target the same widget the later one
+still wins.
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import hashlib
+from collections import namedtuple
+
+# ===== OPERATION KINDS =====
+# Where the value comes from and how it is written
+
+LINE_ITEM = 'line_item'          # fields[key]['value'] → text (greyed if can_be_modified is False)
+TAXPAYER_TEXT = 'taxpayer_text'  # taxpayer[key] → text
+TAXPAYER_NAME = 'taxpayer_name'  # "first_name last_name" → text
+TAXPAYER_ADDRESS = 'taxpayer_address'  # "address, city, state, zip" → text
+CHECKBOX = 'checkbox'            # taxpayer[key] or fields[key]['value'] → on-state / Off
+CHOICE = 'choice'                # taxpayer['status_display'] → on-state of the matching option
+
+# Taxpayer keys that are built from several taxpayer values
+COMBINED_TAXPAYER_KEYS = {
+    'full_name': TAXPAYER_NAME,
+    'employer_name': TAXPAYER_NAME,
+    'property_address_1a': TAXPAYER_ADDRESS,
+}
+
+# One write operation
+#   kind:     one of the operation kinds above
+#   key:      JSON key the value is read from
+#   pdf_field: mapped PDF field name (kept for reports)
+#   entry:    resolved WidgetEntry (None for unresolved line items - reported as skipped)
+#   options:  CHOICE only - normalized status → WidgetEntry
+FillOp = namedtuple('FillOp', 'kind key pdf_field entry options')
+
+
+class FillPlan:
+    """
+    Compiled, validated fill plan for ONE form
+
+    Attributes:
+        form_name (str): Form identifier (e.g., '1040')
+        index (TemplateIndex): Widget index the plan was resolved against
+        template_hash (str): Hash of that template
+        ops (tuple): FillOps in execution order
+        fingerprint (str): Hash of the template AND every resolved mapping -
+            changes whenever either changes (used as a cache version)
+        problems (list): Human-readable mapping problems found while compiling
+    """
+
+    def __init__(self, form_name, index, ops, problems):
+        self.form_name = form_name
+        self.index = index
+        self.template_hash = index.template_hash
+        self.ops = tuple(ops)
+        self.problems = list(problems)
+        self.fingerprint = hashlib.sha256(
+            repr((form_name, self.template_hash, self.ops)).encode('utf-8')
+        ).hexdigest()
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __repr__(self):
+        return f"<FillPlan {self.form_name}: {len(self.ops)} ops, {len(self.problems)} problems>"
+
+
+def _resolve(index, form_name, json_field, pdf_field, problems):
+    """Resolve one mapped name, recording empty/missing/ambiguous names"""
+    if not pdf_field:
+        problems.append(f"{form_name}: {json_field} has an empty PDF field mapping")
+        return None
+
+    candidates = index.candidates(pdf_field)
+    if not candidates:
+        problems.append(f"{form_name}: {json_field} → {pdf_field} not found in template")
+        return None
+    if len(candidates) > 1:
+        problems.append(
+            f"{form_name}: {json_field} → {pdf_field} is ambiguous "
+            f"({len(candidates)} widgets, using {candidates[-1]})"
+        )
+    return index.resolve(pdf_field)
+
+
+def compile_fill_plan(form_name, index, field_mappings, taxpayer_mappings=None, checkbox_mappings=None):
+    """
+    Compile a form's mappings into a FillPlan
+
+    Args:
+        form_name (str): Form identifier (e.g., '1040', 'schedule_a')
+        index (TemplateIndex): Widget index of the form's blank template
+        field_mappings (dict): Line item mappings (JSON key → PDF field)
+        taxpayer_mappings (dict): Taxpayer info mappings (optional)
+        checkbox_mappings (dict): Checkbox mappings (optional)
+
+    Returns:
+        FillPlan
+    """
+    ops = []
+    problems = []
+
+    # ===== 1. LINE ITEMS =====
+    for json_field, pdf_field in field_mappings.items():
+        entry = _resolve(index, form_name, json_field, pdf_field, problems)
+        ops.append(FillOp(LINE_ITEM, json_field, pdf_field, entry, None))
+
+    # ===== 2. TAXPAYER INFO =====
+    for json_field, pdf_field in (taxpayer_mappings or {}).items():
+        entry = _resolve(index, form_name, json_field, pdf_field, problems)
+        if entry is None:
+            continue
+        kind = COMBINED_TAXPAYER_KEYS.get(json_field, TAXPAYER_TEXT)
+        ops.append(FillOp(kind, json_field, pdf_field, entry, None))
+
+    # ===== 3. CHECKBOXES =====
+    for json_field, pdf_field in (checkbox_mappings or {}).items():
+        if isinstance(pdf_field, dict):
+            # Only filing_status is a multi-option checkbox today
+            if json_field != 'filing_status':
+                problems.append(f"{form_name}: {json_field} multi-option checkbox is not filled (unsupported)")
+                continue
+            options = {}
+            for status, target_pdf_field in pdf_field.items():
+                entry = _resolve(index, form_name, f"{json_field}.{status}", target_pdf_field, problems)
+                if entry is not None:
+                    options[status] = entry
+            if options:
+                ops.append(FillOp(CHOICE, json_field, None, None, options))
+        else:
+            entry = _resolve(index, form_name, json_field, pdf_field, problems)
+            if entry is not None:
+                ops.append(FillOp(CHECKBOX, json_field, pdf_field, entry, None))
+
+    return FillPlan(form_name, index, ops, problems)
+
+
+def taxpayer_value(op, taxpayer):
+    """Value for a taxpayer-info op (combined keys are joined here)"""
+    if op.kind == TAXPAYER_NAME:
+        return f"{taxpayer.get('first_name', '')} {taxpayer.get('last_name', '')}".strip()
+    if op.kind == TAXPAYER_ADDRESS:
+        parts = [taxpayer.get('address', ''), taxpayer.get('city', ''),
+                 taxpayer.get('state', ''), taxpayer.get('zip', '')]
+        return ', '.join([p for p in parts if p])
+    return taxpayer.get(op.key, '')
+
+
+def checkbox_state(entry, checked):
+    """Appearance state to write for a checkbox (its real "On" name, or Off)"""
+    if not checked:
+        return "Off"
+    return entry.on_state or "Yes"
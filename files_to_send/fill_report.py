@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fill Report and Metrics for the PDF Filler
+Structured result of one fill, replacing the print() calls in the hot path
+
+ARCHITECTURE:
+- FillReport: counts (filled, greyed, taxpayer, checkboxes), skipped
+  mappings and per-phase timings (plan, open, fill, commit, serialize)
+- emit_report(): logs the report at DEBUG on the 'pdf_filler' logger and
+  hands it to every registered metrics hook
+- install_prometheus_metrics(): optional hook with Prometheus counters and
+  histograms labelled by form name (needs the prometheus_client package)
+
+USAGE:
+    pdf_bytes, report = fill_form_universal(data, '1040', with_report=True)
+    print(report.summary())
+
+    add_metrics_hook(lambda report: statsd.timing(report.form_name, report.total))
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('pdf_filler')
+
+# Timed phases, in execution order
+PHASES = ('plan', 'open', 'fill', 'commit', 'serialize')
+
+
+class FillReport:
+    """
+    What one fill did and how long each phase took
+
+    Attributes:
+        form_name (str): Form identifier (e.g., '1040')
+        filled (int): Line items filled
+        greyed (int): Calculated fields greyed out
+        taxpayer (int): Taxpayer info fields filled
+        checkboxes (int): Checkboxes set
+        skipped (list): "json_key → pdf_field" for values whose field is not in the PDF
+        timings (dict): phase → seconds
+    """
+
+    def __init__(self, form_name):
+        self.form_name = form_name
+        self.filled = 0
+        self.greyed = 0
+        self.taxpayer = 0
+        self.checkboxes = 0
+        self.skipped = []
+        self.timings = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block as one phase (repeated phases add up)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+    def to_dict(self):
+        return {
+            'form_name': self.form_name,
+            'filled': self.filled,
+            'greyed': self.greyed,
+            'taxpayer': self.taxpayer,
+            'checkboxes': self.checkboxes,
+            'skipped': list(self.skipped),
+            'timings_ms': {name: round(seconds * 1000, 3) for name, seconds in self.timings.items()},
+            'total_ms': round(self.total * 1000, 3),
+        }
+
+    def summary(self):
+        lines = [f"✅ Filled {self.filled} line items in {self.form_name} ({self.total * 1000:.1f}ms)"]
+        if self.taxpayer > 0:
+            lines.append(f"   👤 Filled {self.taxpayer} taxpayer info fields")
+        if self.checkboxes > 0:
+            lines.append(f"   ☑️  Filled {self.checkboxes} checkboxes")
+        if self.greyed > 0:
+            lines.append(f"   🔒 Greyed out {self.greyed} calculated fields")
+        if self.skipped:
+            lines.append(f"   ⚠️  Skipped {len(self.skipped)} fields (not found in PDF)")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"<FillReport {self.form_name}: {self.filled} filled, {self.total * 1000:.1f}ms>"
+
+
+# ===== METRICS HOOKS =====
+
+_METRICS_HOOKS = []
+
+
+def add_metrics_hook(hook):
+    """Register a callable(report) run after every fill"""
+    if hook not in _METRICS_HOOKS:
+        _METRICS_HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook):
+    if hook in _METRICS_HOOKS:
+        _METRICS_HOOKS.remove(hook)
+
+
+def emit_report(report):
+    """Log a finished report and pass it to the metrics hooks"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(report.summary())
+        for skipped in report.skipped:
+            logger.debug("   skipped %s", skipped)
+
+    for hook in _METRICS_HOOKS:
+        try:
+            hook(report)
+        except Exception:
+            # A broken metrics backend must never fail a PDF
+            logger.exception("PDF filler metrics hook failed")
+
+
+class PrometheusMetrics:
+    """Metrics hook exporting fill counters and phase histograms per form"""
+
+    def __init__(self, registry=None):
+        from prometheus_client import Counter, Histogram
+
+        kwargs = {'registry': registry} if registry is not None else {}
+        self.fills = Counter(
+            'pdf_filler_fills_total', "Filled PDFs", ['form'], **kwargs)
+        self.fields = Counter(
+            'pdf_filler_fields_total', "Fields written, by kind", ['form', 'kind'], **kwargs)
+        self.skipped = Counter(
+            'pdf_filler_skipped_total', "Values whose PDF field was not found", ['form'], **kwargs)
+        self.seconds = Histogram(
+            'pdf_filler_phase_seconds', "Time per fill phase", ['form', 'phase'], **kwargs)
+
+    def __call__(self, report):
+        form = report.form_name
+        self.fills.labels(form).inc()
+        for kind in ('filled', 'greyed', 'taxpayer', 'checkboxes'):
+            self.fields.labels(form, kind).inc(getattr(report, kind))
+        self.skipped.labels(form).inc(len(report.skipped))
+        for phase, seconds in report.timings.items():
+            self.seconds.labels(form, phase).observe(seconds)
+
+
+def install_prometheus_metrics(registry=None):
+    """
+    Export fill metrics through prometheus_client (optional dependency)
+
+    Raises:
+        ImportError: prometheus_client is not installed
+    """
+    hook = PrometheusMetrics(registry)
+    add_metrics_hook(hook)
+    return hook
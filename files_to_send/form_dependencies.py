@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Cross-Form Dependencies for the PDF Filler
+Which forms must be re-rendered when some fields of a return change
+
+ARCHITECTURE:
+- Graph: (form, json_key) → (form, json_key) edges for values that flow
+  between forms. Most are read straight from the mapping keys, which are
+  the IRS line captions ("... Enter here and on Form 1040, line 8",
+  "Education credits from Form 8863, line 19", "... Attach Schedule C");
+  FORM_LINKS adds the flows whose captions do not say so.
+- Planner: plan_rerender() re-renders the forms whose FILLED values (the
+  part of `data` the fill plan actually writes) differ from the last
+  render. Every form of the return is compared - a signature is cheap and
+  the graph does not model flows inside a form (Schedule 1 line 3 → line
+  10 → Form 1040 line 8) - and the graph reports the changed forms it did
+  not predict (RerenderPlan.unlinked), which point at a missing edge.
+
+USAGE:
+    plan = plan_rerender(
+        changed_fields=[('schedule_1', 'Unemployment compensation')],
+        return_data={'1040': data_1040, 'schedule_1': data_s1, ...},   # after recalculation
+        previous_signatures=stored_signatures,                          # from the last plan
+    )
+    for form_name in plan.forms: ...re-render...
+    stored_signatures.update(plan.signatures)
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import hashlib
+import json
+import logging
+import re
+from collections import namedtuple
+
+try:
+    from .form_mappings_complete import ALL_FORM_MAPPINGS
+    from .pdf_filler import CHECKBOX_MAPPINGS, TAXPAYER_MAPPINGS, _packet_sort_key
+except ImportError:
+    # Standalone mode (not in Django)
+    from form_mappings_complete import ALL_FORM_MAPPINGS
+    from pdf_filler import CHECKBOX_MAPPINGS, TAXPAYER_MAPPINGS, _packet_sort_key
+
+logger = logging.getLogger('pdf_filler')
+
+# Flows not spelled out in the mapping keys: (form, key) → (form, key)
+FORM_LINKS = [
+    (('schedule_2', '3'), ('1040', '17')),
+    (('schedule_2', '21'), ('1040', '23')),
+    (('schedule_d', '16'), ('1040', '7')),
+    (('schedule_d', '21'), ('1040', '7')),
+    (('schedule_se', '12'), ('schedule_2', '4')),
+    (('schedule_se', '13'), ('schedule_1', 'Deductible part of self-employment tax. Attach Schedule SE')),
+    (('schedule_b', '4'), ('1040', '2b')),
+    (('schedule_b', '6'), ('1040', '3b')),
+    (('8995', '15'), ('1040', '13')),
+    (('8812', '14'), ('1040', '19')),
+    (('8812', '27'), ('1040', '28')),
+    (('8863', '8'), ('1040', '29')),
+]
+
+# "Enter here and on Form 1040 or 1040-SR, line 10, ..." → this key feeds 1040 line 10
+_ENTER_ON_1040 = re.compile(r"on Form 1040\b.*?\bline (\d+[a-z]?)", re.IGNORECASE)
+# "Education credits from Form 8863, line 19" → Form 8863 line 19 feeds this key
+# ("from Form 1040 or 1040-SR, line 11" → Form 1040 line 11)
+_FROM_FORM = re.compile(r"from Form (?:Form )?(\d{4})(?: or \d{4}-[A-Z]+)?(?:, line (\d+[a-z]?))?")
+# "Attach Schedule C" / "Attach Form 8889" → that whole form feeds this key
+_ATTACH = re.compile(r"Attach (Schedule [A-Z0-9]+|Form \d{4})")
+
+# Key that stands for "any field of this form" in form-level edges
+ANY_FIELD = None
+
+
+def _form_name(reference):
+    """'Schedule SE' → 'schedule_se', 'Form 8889' → '8889'"""
+    if reference.startswith('Schedule '):
+        return 'schedule_' + reference.split()[1].lower()
+    return reference.split()[-1]
+
+
+class FormDependencyGraph:
+    """
+    Directed graph of value flows between form fields
+
+    Attributes:
+        edges (dict): (form, key) → set of (form, key) it feeds. A source
+            key of ANY_FIELD means "any change in that form".
+    """
+
+    def __init__(self, links=()):
+        self.edges = {}
+        for source, target in links:
+            self.add(source, target)
+
+    def add(self, source, target):
+        self.edges.setdefault(source, set()).add(target)
+
+    def affected(self, changed_fields):
+        """
+        Every (form, key) reachable from the changed fields (themselves included)
+
+        Args:
+            changed_fields: Iterable of (form_name, json_key)
+        """
+        seen = set()
+        stack = list(changed_fields)
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            form_name = node[0]
+            stack.extend(self.edges.get(node, ()))
+            stack.extend(self.edges.get((form_name, ANY_FIELD), ()))
+        return seen
+
+    def affected_forms(self, changed_fields):
+        return {form_name for form_name, _ in self.affected(changed_fields)}
+
+
+def build_dependency_graph(mappings=None, links=FORM_LINKS):
+    """Build the graph from the mapping keys plus explicit links"""
+    mappings = ALL_FORM_MAPPINGS if mappings is None else mappings
+    graph = FormDependencyGraph(links)
+
+    for form_name, field_mappings in mappings.items():
+        for json_field in field_mappings:
+            match = _ENTER_ON_1040.search(json_field)
+            if match and form_name != '1040' and match.group(1) in mappings.get('1040', {}):
+                graph.add((form_name, json_field), ('1040', match.group(1)))
+
+            for source_form, source_line in _FROM_FORM.findall(json_field):
+                if source_form in mappings and source_form != form_name:
+                    source_key = source_line if source_line in mappings[source_form] else ANY_FIELD
+                    graph.add((source_form, source_key), (form_name, json_field))
+
+            for reference in _ATTACH.findall(json_field):
+                source_form = _form_name(reference)
+                if source_form in mappings and source_form != form_name:
+                    graph.add((source_form, ANY_FIELD), (form_name, json_field))
+
+    return graph
+
+
+_GRAPH = None
+
+
+def get_dependency_graph():
+    """Process-wide graph (built on first use)"""
+    global _GRAPH
+    if _GRAPH is None:
+        _GRAPH = build_dependency_graph()
+    return _GRAPH
+
+
+def fill_signature(form_name, data):
+    """
+    Hash of exactly the values the fill writes for a form
+
+    Labels, ftype and unmapped keys are ignored, so editing them does not
+    trigger a re-render.
+    """
+    fields = data.get('fields', {})
+    taxpayer = data.get('taxpayer', {})
+
+    written = {
+        'fields': {
+            key: [fields[key].get('value'), fields[key].get('can_be_modified', True)]
+            for key in ALL_FORM_MAPPINGS.get(form_name, {})
+            if key in fields
+        },
+        # Combined keys (full_name, addresses, filing status) read several
+        # taxpayer values, so the whole taxpayer block counts when mapped
+        'taxpayer': taxpayer if form_name in TAXPAYER_MAPPINGS or form_name in CHECKBOX_MAPPINGS else {},
+        'checkboxes': {
+            key: fields[key].get('value')
+            for key in CHECKBOX_MAPPINGS.get(form_name, {})
+            if key in fields
+        },
+    }
+    canonical = json.dumps(written, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# Result of plan_rerender()
+#   forms:      form names to re-render, in packet order
+#   signatures: form_name → new fill_signature() for those forms (store after rendering)
+#   unchanged:  reachable forms skipped because their filled values did not change
+#   unlinked:   re-rendered forms the graph does not reach from the changed
+#               fields (rendered before, so a missing edge in the graph)
+RerenderPlan = namedtuple('RerenderPlan', 'forms signatures unchanged unlinked')
+
+
+def plan_rerender(changed_fields, return_data, previous_signatures, graph=None):
+    """
+    Decide which forms of a return need a new PDF
+
+    Args:
+        changed_fields: Iterable of (form_name, json_key) that were edited
+        return_data (dict): form_name → CURRENT data (after your recalculation
+            propagated the totals between forms)
+        previous_signatures (dict): form_name → fill_signature() of its last
+            render (missing = never rendered)
+        graph (FormDependencyGraph): Defaults to get_dependency_graph()
+
+    Returns:
+        RerenderPlan
+    """
+    graph = graph or get_dependency_graph()
+    reachable = graph.affected_forms(changed_fields)
+
+    forms = []
+    signatures = {}
+    unchanged = []
+    unlinked = []
+    for form_name in sorted(return_data, key=_packet_sort_key):
+        signature = fill_signature(form_name, return_data[form_name])
+        previous = previous_signatures.get(form_name)
+        if previous == signature:
+            if form_name in reachable:
+                unchanged.append(form_name)
+            continue
+        forms.append(form_name)
+        signatures[form_name] = signature
+        if previous is not None and form_name not in reachable:
+            unlinked.append(form_name)
+
+    if unlinked:
+        logger.debug("Re-rendering %s: changed without a dependency edge from %s",
+                     ', '.join(unlinked), sorted(set(changed_fields)))
+    return RerenderPlan(forms, signatures, unchanged, unlinked)
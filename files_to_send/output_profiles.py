@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Output Profiles for the PDF Filler
+Named PyMuPDF save options trading serialize CPU for output size
+
+ARCHITECTURE:
+- Every full save (fill_form_universal, generate_return_packet, print mode)
+  goes through save_options(), which resolves a profile name to the
+  keyword arguments of doc.save() / doc.tobytes()
+- Profiles, smallest CPU cost first:
+    * default:  PyMuPDF defaults - the output used before profiles existed
+    * compact:  drop unused objects, deflate uncompressed streams
+    * small:    + compact the xref table, deflate fonts, pack objects
+                into object streams
+    * archive:  + merge duplicate objects (fonts repeated across the merged
+                forms of a packet), deflate images
+- Measure the trade-off on your templates with
+  `python benchmark_filler.py --profiles default compact small archive`
+
+NOTE: small/archive renumber objects (renumbers_objects()), so
+patch_filled_pdf() cannot patch such a file in place: given the profile it
+fills from scratch, and it also checks every widget it would write (page
+and full field name) and fills from scratch on any mismatch. Incremental
+fills (fill_form_incremental) never use a profile.
+
+CONFIGURATION (environment):
+    PDF_OUTPUT_PROFILE   Profile used when none is passed (default: default)
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import os
+
+# Profile name → doc.save() keyword arguments
+OUTPUT_PROFILES = {
+    'default': {},
+    'compact': {'garbage': 1, 'deflate': True},
+    'small': {'garbage': 3, 'deflate': True, 'deflate_fonts': True, 'use_objstms': 1},
+    'archive': {'garbage': 4, 'deflate': True, 'deflate_fonts': True, 'deflate_images': True, 'use_objstms': 1},
+}
+
+# Minimum for flattened (print mode) PDFs: drop the orphaned widget and font
+# objects left by flatten_document() and compress the new page content
+FLATTENED_SAVE_OPTIONS = {'garbage': 3, 'deflate': True}
+
+OUTPUT_PROFILE = os.environ.get('PDF_OUTPUT_PROFILE', 'default')
+
+
+def resolve_profile(name=None):
+    """
+    Profile name to use (`name`, else PDF_OUTPUT_PROFILE)
+
+    Raises:
+        ValueError: Unknown profile
+    """
+    name = name or OUTPUT_PROFILE
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown PDF output profile '{name}' (choose from {', '.join(OUTPUT_PROFILES)})")
+    return name
+
+
+def renumbers_objects(name=None):
+    """True when a profile's save renumbers objects (xrefs of the template no longer apply)"""
+    return OUTPUT_PROFILES[resolve_profile(name)].get('garbage', 0) >= 2
+
+
+def save_options(name=None, flatten=False):
+    """doc.save() keyword arguments for a profile (raised to the print-mode minimum with flatten)"""
+    options = dict(OUTPUT_PROFILES[resolve_profile(name)])
+    if flatten:
+        options['garbage'] = max(options.get('garbage', 0), FLATTENED_SAVE_OPTIONS['garbage'])
+        options['deflate'] = True
+    return options
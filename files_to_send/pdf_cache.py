@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Filled-PDF Cache for the PDF Filler
+Content-addressed store of filled PDFs, so an unchanged form is never refilled
+
+ARCHITECTURE:
+- Key: SHA-256 of (fill plan fingerprint, canonical JSON of data, fill options).
+  The plan fingerprint already covers the template hash AND every mapping,
+  so a new IRS template or an edited mapping produces new keys.
+- Backends: MemoryPDFCache (LRU with a byte budget) or DiskPDFCache.
+  The memory cache is PER WORKER PROCESS - N workers use up to N × the
+  budget - so the default is small; use the disk cache (shared by every
+  worker on the host) for a large cache.
+- The same key doubles as the HTTP ETag of TaxpayerFormPDFView
+
+CONFIGURATION (environment):
+    PDF_CACHE_BACKEND    'memory' (default), 'disk' or 'none'
+    PDF_CACHE_MAX_BYTES  Memory budget in bytes per worker process (default: 32 MB)
+    PDF_CACHE_MAX_ENTRY_BYTES  Largest PDF kept in memory (default: 1/8 of the budget)
+    PDF_CACHE_DIR        Directory of the disk cache (default: .pdf_cache next to this file)
+
+Or in code: set_pdf_cache(DiskPDFCache('/srv/pdf_cache'))
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+
+def cache_key(plan_fingerprint, data, **options):
+    """
+    Content address of one filled PDF
+
+    Args:
+        plan_fingerprint (str): FillPlan.fingerprint of the form
+        data (dict): Form data (taxpayer + fields); key order does not matter
+        **options: Fill options that change the output (grey_out_calculated...)
+    """
+    canonical = json.dumps(
+        {'plan': plan_fingerprint, 'data': data, 'options': options},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# ===== BACKENDS =====
+
+# Default MemoryPDFCache budget per worker process
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+class MemoryPDFCache:
+    """In-process LRU cache bounded by total PDF bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        # Larger PDFs are not kept (one big packet must not flush the cache)
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 8
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf_bytes = self._items.get(key)
+            if pdf_bytes is not None:
+                self._items.move_to_end(key)
+            return pdf_bytes
+
+    def set(self, key, pdf_bytes):
+        if len(pdf_bytes) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = pdf_bytes
+            self.size += len(pdf_bytes)
+            # Evict least recently used until we are back under budget
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def set_file(self, key, f):
+        """
+        Store a PDF from a file object positioned at its start
+
+        Returns:
+            bytes: The cached PDF - serve these instead of `f` so the PDF
+                is not held twice - or None when it is over max_entry_bytes
+                (`f` is then not read)
+        """
+        start = f.tell()
+        size = f.seek(0, os.SEEK_END) - start
+        f.seek(start)
+        if size > self.max_entry_bytes:
+            return None
+        pdf_bytes = f.read()
+        self.set(key, pdf_bytes)
+        return pdf_bytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+class DiskPDFCache:
+    """
+    PDFs stored as <directory>/<key[:2]>/<key>.pdf
+
+    Shared by every worker process on the host. Entries are immutable (the
+    key is a content hash), so stale files are only ever unused - prune the
+    directory by age with a cron job if disk space matters.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key, pdf_bytes):
+        """Store a PDF (best effort - a read-only disk just skips it)"""
+        self._write(key, lambda out: out.write(pdf_bytes))
+
+    def set_file(self, key, f):
+        """
+        Store a PDF from a file object positioned at its start, copied in
+        chunks (never read into memory as a whole)
+
+        Returns:
+            None - the caller keeps serving `f` (rewind it first)
+        """
+        self._write(key, lambda out: shutil.copyfileobj(f, out))
+        return None
+
+    def _write(self, key, write):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as out:
+                write(out)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.pdf'):
+                    os.remove(os.path.join(root, name))
+
+
+# ===== ACTIVE CACHE =====
+
+def _cache_from_environment():
+    backend = os.environ.get('PDF_CACHE_BACKEND', 'memory')
+    if backend == 'none':
+        return None
+    if backend == 'disk':
+        return DiskPDFCache(os.environ.get(
+            'PDF_CACHE_DIR',
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pdf_cache'),
+        ))
+    if backend == 'memory':
+        return MemoryPDFCache(
+            int(os.environ.get('PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)),
+            int(os.environ.get('PDF_CACHE_MAX_ENTRY_BYTES', 0)) or None,
+        )
+    raise ValueError(f"Unknown PDF_CACHE_BACKEND: {backend} (use 'memory', 'disk' or 'none')")
+
+
+_PDF_CACHE = _cache_from_environment()
+
+
+def get_pdf_cache():
+    """Active cache backend (None = caching disabled)"""
+    return _PDF_CACHE
+
+
+def set_pdf_cache(cache):
+    """Replace the active cache backend (None disables caching)"""
+    global _PDF_CACHE
+    _PDF_CACHE = cache
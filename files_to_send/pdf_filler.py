@@ -13,7 +13,9 @@ Example: /path/to/django_app/pdf_filler.py (next to views.py)
 """
 
 import fitz  # PyMuPDF
+import io
 import os
+import tempfile
 
 # Import ALL mappings including new taxpayer_info and checkboxes
 try:
@@ -32,6 +34,16 @@ try:
         SCHEDULE_2_TAXPAYER_INFO, SCHEDULE_2_CHECKBOXES,
         SCHEDULE_3_TAXPAYER_INFO,
     )
+    from .template_index import BUTTON_TYPES, get_template_index
+    from .widget_writes import WidgetWriteBatch, _field_xref
+    from .fill_report import FillReport, emit_report
+    from .pdf_cache import cache_key, get_pdf_cache
+    from .template_store import get_template_bytes, open_template
+    from .output_profiles import renumbers_objects, resolve_profile, save_options
+    from .fill_plan import (
+        CHECKBOX, CHOICE, LINE_ITEM,
+        checkbox_state, compile_fill_plan, taxpayer_value,
+    )
 except ImportError:
     # Standalone mode (not in Django)
     from form_mappings_complete import ALL_FORM_MAPPINGS, FORM_TEMPLATES
@@ -48,6 +60,16 @@ except ImportError:
         SCHEDULE_2_TAXPAYER_INFO, SCHEDULE_2_CHECKBOXES,
         SCHEDULE_3_TAXPAYER_INFO,
     )
+    from template_index import BUTTON_TYPES, get_template_index
+    from widget_writes import WidgetWriteBatch, _field_xref
+    from fill_report import FillReport, emit_report
+    from pdf_cache import cache_key, get_pdf_cache
+    from template_store import get_template_bytes, open_template
+    from output_profiles import renumbers_objects, resolve_profile, save_options
+    from fill_plan import (
+        CHECKBOX, CHOICE, LINE_ITEM,
+        checkbox_state, compile_fill_plan, taxpayer_value,
+    )
 
 # Map form names to their taxpayer/checkbox mappings
 TAXPAYER_MAPPINGS = {
@@ -90,7 +112,201 @@ FORM_ID_TO_TEMPLATE = {
     # etc...
 }
 
-def fill_form_universal(data, form_name, grey_out_calculated=True):
+# Streaming output: PDFs up to this size stay in memory, larger ones spill
+# to a temporary file (per request, override with PDF_STREAM_MAX_MEMORY)
+STREAM_MAX_MEMORY = int(os.environ.get('PDF_STREAM_MAX_MEMORY', 8 * 1024 * 1024))
+
+# Compiled fill plans: form_name → FillPlan (recompiled if the template changes)
+_FILL_PLANS = {}
+
+
+def get_template_path(form_name):
+    """
+    Absolute path of a form's blank template
+    
+    Raises:
+        ValueError: Unknown form name
+        FileNotFoundError: Template file missing from TEMPLATE_DIR
+    """
+    if form_name not in FORM_TEMPLATES:
+        raise ValueError(f"Unknown form: {form_name}. Available forms: {list(FORM_TEMPLATES.keys())}")
+    
+    template_path = os.path.join(TEMPLATE_DIR, FORM_TEMPLATES[form_name])
+    
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template not found: {template_path}")
+    
+    return template_path
+
+
+def get_fill_plan(form_name):
+    """
+    Return the compiled FillPlan for a form (compiled once, then cached)
+    
+    Every mapping in ALL_FORM_MAPPINGS / TAXPAYER_MAPPINGS / CHECKBOX_MAPPINGS
+    is resolved against the template's widget index a single time.
+    """
+    template_path = get_template_path(form_name)
+    
+    # Get field mappings for this form (JSON field name → PDF field name)
+    if form_name not in ALL_FORM_MAPPINGS:
+        raise ValueError(f"No mappings found for form: {form_name}")
+    
+    # Compiled widget index (built once per template, cached in memory and on disk)
+    index = get_template_index(template_path)
+    
+    plan = _FILL_PLANS.get(form_name)
+    if plan is None or plan.template_hash != index.template_hash:
+        plan = compile_fill_plan(
+            form_name,
+            index,
+            ALL_FORM_MAPPINGS[form_name],
+            TAXPAYER_MAPPINGS.get(form_name),
+            CHECKBOX_MAPPINGS.get(form_name),
+        )
+        _FILL_PLANS[form_name] = plan
+    
+    return plan
+
+
+def compile_fill_plans(strict=False):
+    """
+    Compile and validate the fill plans of ALL forms (call once at startup)
+    
+    Args:
+        strict (bool): Raise ValueError if any mapping problem is found
+    
+    Returns:
+        dict: form_name → list of mapping problems (empty list = clean)
+    """
+    problems = {}
+    for form_name in FORM_TEMPLATES:
+        problems[form_name] = get_fill_plan(form_name).problems
+    
+    if strict:
+        found = [p for form_problems in problems.values() for p in form_problems]
+        if found:
+            raise ValueError(f"{len(found)} mapping problems:\n" + '\n'.join(found))
+    
+    return problems
+
+
+def _run_plan(ops, data, grey_out_calculated, batch, report):
+    """
+    Queue the writes of fill plan ops for one data dict into `batch`
+    
+    Counts and skipped mappings go to `report`. Used for full fills and,
+    with a subset of the ops, by patch_filled_pdf().
+    """
+    # Extract data
+    taxpayer = data.get('taxpayer', {})
+    fields_data = data.get('fields', {})
+    
+    # ===== RUN THE PLAN =====
+    for op in ops:
+        kind = op.kind
+        
+        if kind == LINE_ITEM:
+            # Check if this field has data in the input JSON
+            field_info = fields_data.get(op.key)
+            
+            if not field_info:
+                continue
+            
+            # Get the ACTUAL VALUE to fill (not the field name!)
+            value = field_info.get('value')
+            can_modify = field_info.get('can_be_modified', True)
+            
+            if value is None or value == '':
+                continue
+            
+            if op.entry is None:
+                report.skipped.append(f"{op.key} → {op.pdf_field}")
+                continue
+            
+            # Fill the field with ACTUAL VALUE
+            batch.set_value(op.entry, str(value))  # e.g., "75000" not "1a"
+            report.filled += 1
+            
+            # Grey out if calculated field
+            if grey_out_calculated and not can_modify:
+                batch.set_read_only(op.entry)
+                report.greyed += 1
+        
+        elif kind == CHECKBOX:
+            value = taxpayer.get(op.key)
+            if value is None and op.key in fields_data:
+                value = fields_data[op.key].get('value', False)
+            
+            if value is None:
+                continue
+            
+            batch.set_value(op.entry, checkbox_state(op.entry, value))
+            report.checkboxes += 1
+        
+        elif kind == CHOICE:
+            # Filing status (multi-option)
+            status_value = taxpayer.get('status_display', '').lower().replace(' ', '_')
+            entry = op.options.get(status_value)
+            
+            if entry is None:
+                continue
+            
+            batch.set_value(entry, checkbox_state(entry, True))
+            report.checkboxes += 1
+        
+        else:
+            # Taxpayer info (plain or combined keys like full_name)
+            value = taxpayer_value(op, taxpayer)
+            
+            if not value:
+                continue
+            
+            batch.set_value(op.entry, str(value))
+            report.taxpayer += 1
+
+
+def _fill_document(data, form_name, grey_out_calculated=True, need_appearances=False, source_path=None):
+    """
+    Fill a blank template and return (OPEN document, FillReport)
+    
+    Shared by fill_form_universal(), fill_form_incremental() and
+    generate_return_packet(). Writes are batched so every widget is
+    committed exactly once. The caller closes the document, times its
+    'serialize' phase and passes the report to emit_report().
+    
+    source_path: Open this byte-identical copy of the template instead of
+        the template itself (incremental saves write into the opened file)
+    """
+    report = FillReport(form_name)
+    
+    # Compiled fill plan (every mapping already resolved to a widget slot)
+    with report.phase('plan'):
+        plan = get_fill_plan(form_name)
+        index = plan.index
+    
+    # Load blank template (parsed from the in-memory template bytes)
+    with report.phase('open'):
+        if source_path:
+            doc = fitz.open(source_path)
+        else:
+            doc = open_template(index.template_path)
+    
+    # Queued widget writes (committed once per widget after the plan ran)
+    batch = WidgetWriteBatch()
+    
+    with report.phase('fill'):
+        _run_plan(plan.ops, data, grey_out_calculated, batch, report)
+    
+    # ===== COMMIT (one update per widget) =====
+    with report.phase('commit'):
+        batch.commit(doc, index, need_appearances)
+    
+    return doc, report
+
+
+def fill_form_universal(data, form_name, grey_out_calculated=True, need_appearances=False, output=None,
+                        with_report=False, flatten=False, output_profile=None):
     """
     Universal PDF filler for ALL IRS forms using verified mappings
     
@@ -119,191 +335,418 @@ def fill_form_universal(data, form_name, grey_out_calculated=True):
             }
         form_name (str): Form identifier (e.g., '1040', 'schedule_a', 'schedule_d')
         grey_out_calculated (bool): If True, grey out fields where can_be_modified=False
+        need_appearances (bool): If True, skip appearance generation and let the
+            viewer build it (/NeedAppearances) - faster, but only for viewers
+            that honour the flag (Acrobat, pdf.js, Chrome)
+        output: Optional writable binary file object (see open_pdf_spool()).
+            The PDF is saved straight into it instead of building a bytes copy.
+        with_report (bool): Also return the FillReport (counts, skipped
+            mappings, per-phase timings - see fill_report.py)
+        flatten (bool): Print mode - burn the values into the page content
+            and drop the form (see flatten_document()). Read-only, smaller,
+            faster to display. need_appearances is ignored (flattening
+            needs the appearance streams).
+        output_profile (str): Save options profile (see output_profiles.py;
+            default PDF_OUTPUT_PROFILE)
     
     Returns:
-        bytes: PDF file content (editable PDF with ACTUAL VALUES filled in)
+        bytes: PDF file content (editable PDF with ACTUAL VALUES filled in),
+            or `output` when one was given; (result, FillReport) with with_report=True
     """
-    # Get template filename
-    if form_name not in FORM_TEMPLATES:
-        raise ValueError(f"Unknown form: {form_name}. Available forms: {list(FORM_TEMPLATES.keys())}")
+    if flatten:
+        need_appearances = False
+    options = save_options(output_profile, flatten)
     
-    template_file = FORM_TEMPLATES[form_name]
-    template_path = os.path.join(TEMPLATE_DIR, template_file)
+    doc, report = _fill_document(data, form_name, grey_out_calculated, need_appearances)
     
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template not found: {template_path}")
+    try:
+        with report.phase('serialize'):
+            if flatten:
+                flatten_document(doc)
+            
+            if output is not None:
+                doc.save(_SaveTarget(output), **options)
+                result = output
+            else:
+                # Return PDF as bytes
+                result = doc.tobytes(**options)
+    finally:
+        doc.close()
     
-    # Get field mappings for this form (JSON field name → PDF field name)
-    if form_name not in ALL_FORM_MAPPINGS:
-        raise ValueError(f"No mappings found for form: {form_name}")
+    emit_report(report)
+    return (result, report) if with_report else result
+
+
+def flatten_document(doc):
+    """
+    Turn a filled form into a plain, read-only document (in place)
     
-    field_mappings = ALL_FORM_MAPPINGS[form_name]
-    
-    # Load blank template
-    doc = fitz.open(template_path)
-    
-    # Build field path map (BOTH full and short names → (page, widget))
-    # Store page reference to avoid "not bound to page" error
-    field_map = {}
-    for page_num in range(doc.page_count):
-        page = doc[page_num]
-        for widget in page.widgets():
-            if widget.field_name:
-                full_name = widget.field_name
-                # Store by full name
-                field_map[full_name] = (page, widget)
-                # Also store by short name (e.g., "f1_47[0]")
-                if '.' in full_name:
-                    short_name = full_name.split('.')[-1]
-                    field_map[short_name] = (page, widget)
-    
-    # Track filling stats
-    filled_count = 0
-    grey_count = 0
-    taxpayer_filled = 0
-    checkbox_filled = 0
-    skipped = []
+    - Empty text fields with no background or border are dropped: their
+      appearance draws nothing, and baking each one would add a Form
+      XObject (over 1,700 on Form 3800) - more than flattening saves
+    - Every other widget's appearance is baked into its page's content and
+      the widget annotations are removed
+    - Structure tree references to the widgets are cut, so the widget,
+      field and appearance objects are really orphaned
+    - The AcroForm dictionary and the usage-rights signature (/Perms,
+      invalid once the form is gone) are dropped
+    - Embedded fonts are subset to the glyphs actually used
     
-    # Extract data
-    taxpayer = data.get('taxpayer', {})
-    fields_data = data.get('fields', {})
+    Save with save_options(flatten=True) so the orphaned objects are not
+    written.
+    """
+    widgets = set()
+    for page in doc:
+        annots = page.annot_xrefs()
+        page_widgets = {xref for xref, annot_type, _ in annots if annot_type == fitz.PDF_ANNOT_WIDGET}
+        blank = {xref for xref in page_widgets if _is_blank_text_widget(doc, xref)}
+        if blank:
+            kept = ' '.join(f"{xref} 0 R" for xref, _, _ in annots if xref not in blank)
+            doc.xref_set_key(page.xref, "Annots", f"[{kept}]")
+        widgets |= page_widgets
     
-    # ===== 1. FILL LINE ITEMS =====
-    for json_field, pdf_field in field_mappings.items():
-        # Check if this field has data in the input JSON
-        field_info = fields_data.get(json_field)
-        
-        if not field_info:
-            continue
-        
-        # Get the ACTUAL VALUE to fill (not the field name!)
-        value = field_info.get('value')
-        can_modify = field_info.get('can_be_modified', True)
-        
-        if value is None or value == '':
-            continue
-        
-        # Find the PDF field widget (try exact match first)
-        if pdf_field in field_map:
-            page, widget = field_map[pdf_field]
-        else:
-            skipped.append(f"{json_field} → {pdf_field}")
+    doc.bake(annots=False, widgets=True)
+    
+    catalog = doc.pdf_catalog()
+    doc.xref_set_key(catalog, "AcroForm", "null")
+    doc.xref_set_key(catalog, "Perms", "null")
+    
+    # Tagged templates (all IRS forms) point at every widget from a
+    # structure element: /K << /Type /OBJR /Obj <widget> >>
+    for xref in range(1, doc.xref_length()):
+        try:
+            kind, value = doc.xref_get_key(xref, "K/Obj")
+        except Exception:
+            # Free xref slot
             continue
+        if kind == 'xref' and int(value.split()[0]) in widgets:
+            doc.xref_set_key(xref, "K", "null")
+    
+    doc.subset_fonts()
+
+
+def _is_blank_text_widget(doc, xref):
+    """Text widget with no value, background or border (its appearance draws nothing)"""
+    field_xref = _field_xref(doc, xref)
+    if doc.xref_get_key(field_xref, "FT")[1] != '/Tx':
+        return False
+    kind, value = doc.xref_get_key(field_xref, "V")
+    if kind != 'null' and value:
+        return False
+    return doc.xref_get_key(xref, "MK/BG")[0] == 'null' and doc.xref_get_key(xref, "MK/BC")[0] == 'null'
+
+
+def open_pdf_spool(max_memory=None):
+    """
+    Writable buffer for one streamed PDF
+    
+    Stays in memory up to `max_memory` bytes (default STREAM_MAX_MEMORY),
+    then rolls over to a temporary file - so a large merged document never
+    costs more than the ceiling in RAM per request.
+    """
+    if max_memory is None:
+        max_memory = STREAM_MAX_MEMORY
+    return tempfile.SpooledTemporaryFile(max_size=max_memory, mode='w+b')
+
+
+class _SaveTarget:
+    """
+    File object wrapper for Document.save()
+    
+    PyMuPDF treats any object with a `name` attribute as a path - a
+    SpooledTemporaryFile's name is None (in memory) or a descriptor number
+    (rolled over), so it is hidden here and save() writes through the file
+    methods instead.
+    """
+    
+    def __init__(self, file):
+        self._file = file
+    
+    def __getattr__(self, attr):
+        if attr == 'name':
+            raise AttributeError(attr)
+        return getattr(self._file, attr)
+
+
+class IncrementalPDF:
+    """
+    Filled PDF = untouched template bytes + appended update section
+    
+    Attributes:
+        prefix: Read-only memory map of the blank template (zero-copy)
+        tail (bytes): Changed widget/appearance objects + new xref section
+    
+    Iterating yields the two chunks, so it can be handed directly to
+    Django's StreamingHttpResponse without joining them.
+    """
+    
+    def __init__(self, prefix, tail):
+        self.prefix = prefix
+        self.tail = tail
+    
+    def __len__(self):
+        return len(self.prefix) + len(self.tail)
+    
+    def __iter__(self):
+        if len(self.prefix):
+            yield memoryview(self.prefix)
+        yield self.tail
+    
+    def write_to(self, fileobj):
+        for chunk in self:
+            fileobj.write(chunk)
+    
+    def tobytes(self):
+        return bytes(self.prefix) + self.tail
+
+
+def fill_form_incremental(data, form_name, grey_out_calculated=True, need_appearances=False, with_report=False):
+    """
+    Fill a form with an INCREMENTAL save (same arguments as fill_form_universal)
+    
+    The template is never re-serialized: only the modified widget and
+    appearance objects plus a new xref section are written after the
+    original bytes. Templates PyMuPDF cannot update incrementally (repaired
+    or encrypted files) fall back to a full save with an empty prefix.
+    
+    Returns:
+        IncrementalPDF; (IncrementalPDF, FillReport) with with_report=True
+    """
+    template_bytes = get_template_bytes(get_fill_plan(form_name).index.template_path)
+    
+    # saveIncr() appends to the file the document was opened from, so fill a
+    # scratch copy written from the same map the prefix is served from
+    fd, scratch_path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as scratch:
+            scratch.write(template_bytes)
         
-        # Fill the field with ACTUAL VALUE
-        widget.field_value = str(value)  # e.g., "75000" not "1a"
-        widget.update()
-        filled_count += 1
+        doc, report = _fill_document(data, form_name, grey_out_calculated, need_appearances, source_path=scratch_path)
+        try:
+            with report.phase('serialize'):
+                if doc.can_save_incrementally():
+                    doc.saveIncr()
+                    result = None
+                else:
+                    result = IncrementalPDF(b'', doc.tobytes())
+        finally:
+            doc.close()
         
-        # Grey out if calculated field
-        if grey_out_calculated and not can_modify:
-            widget.field_flags |= fitz.PDF_FIELD_IS_READ_ONLY
-            widget.fill_color = (0.9, 0.9, 0.9)
-            widget.update()
-            grey_count += 1
-    
-    # ===== 2. FILL TAXPAYER INFO =====
-    if form_name in TAXPAYER_MAPPINGS:
-        taxpayer_mappings = TAXPAYER_MAPPINGS[form_name]
+        if result is None:
+            with report.phase('serialize'), open(scratch_path, 'rb') as scratch:
+                scratch.seek(len(template_bytes))
+                result = IncrementalPDF(template_bytes, scratch.read())
+    finally:
+        os.remove(scratch_path)
+    
+    emit_report(report)
+    return (result, report) if with_report else result
+
+
+def changed_fields(old_data, new_data):
+    """
+    JSON keys whose entry differs between two data dicts
+    
+    Returns:
+        (set of changed `fields` keys, set of changed `taxpayer` keys)
+    """
+    old_fields = old_data.get('fields', {})
+    new_fields = new_data.get('fields', {})
+    fields = {
+        key for key in old_fields.keys() | new_fields.keys()
+        if old_fields.get(key) != new_fields.get(key)
+    }
+    
+    old_taxpayer = old_data.get('taxpayer', {})
+    new_taxpayer = new_data.get('taxpayer', {})
+    taxpayer = {
+        key for key in old_taxpayer.keys() | new_taxpayer.keys()
+        if old_taxpayer.get(key) != new_taxpayer.get(key)
+    }
+    return fields, taxpayer
+
+
+def _op_entries(op):
+    if op.kind == CHOICE:
+        return op.options.values()
+    return (op.entry,) if op.entry is not None else ()
+
+
+def _patch_ops(plan, fields, taxpayer):
+    """
+    Plan ops affected by the changed keys, in plan order
+    
+    Every op writing to a touched widget is included, so when two mappings
+    share a widget the later one still wins exactly as in a full fill.
+    """
+    touched = set()
+    for op in plan.ops:
+        if op.key in fields or (taxpayer and op.kind != LINE_ITEM):
+            touched.update(entry.xref for entry in _op_entries(op))
+    return [op for op in plan.ops if any(entry.xref in touched for entry in _op_entries(op))]
+
+
+def _full_field_name(doc, xref):
+    """Fully qualified field name of a widget (its /T joined with every parent's)"""
+    parts = []
+    for _ in range(32):  # guards against /Parent cycles
+        kind, name = doc.xref_get_key(xref, "T")
+        if kind == 'string':
+            parts.append(name)
+        kind, parent = doc.xref_get_key(xref, "Parent")
+        if kind != 'xref':
+            break
+        xref = int(parent.split()[0])
+    return '.'.join(reversed(parts))
+
+
+def _matches_template(doc, entries):
+    """
+    Every entry's xref is still the same widget: on the same page, with the
+    same full field name (renumbered files point xrefs at other objects)
+    """
+    page_widgets = {}
+    for entry in entries:
+        if entry.page >= doc.page_count:
+            return False
+        widgets = page_widgets.get(entry.page)
+        if widgets is None:
+            widgets = page_widgets[entry.page] = {
+                xref for xref, annot_type, _ in doc[entry.page].annot_xrefs()
+                if annot_type == fitz.PDF_ANNOT_WIDGET
+            }
+        if entry.xref not in widgets or _full_field_name(doc, entry.xref) != entry.name:
+            return False
+    return True
+
+
+def patch_filled_pdf(previous_pdf, old_data, new_data, form_name, grey_out_calculated=True,
+                     need_appearances=False, with_report=False, output_profile=None):
+    """
+    Update a previously filled PDF with only the values that changed
+    
+    Only the widgets whose written value or grey-out differs between
+    `old_data` and `new_data` are touched, and the result is an incremental
+    save: the previous PDF bytes unchanged + the changed objects appended.
+    A one-line edit therefore costs one widget update, not a full fill.
+    
+    Fields that became empty are cleared ("" / checkbox Off) and fields
+    that became editable lose their read-only flag and grey background.
+    
+    Args:
+        previous_pdf: bytes (or IncrementalPDF) produced by fill_form_universal()
+            / fill_form_incremental() / an earlier patch for `old_data`
+        old_data (dict): Data the previous PDF was filled with
+        new_data (dict): Data to fill now
+        form_name (str): Form identifier
+        grey_out_calculated, need_appearances: As for fill_form_universal()
+            (use the same values the previous PDF was filled with)
+        with_report (bool): Also return the FillReport (counts = patched writes)
+        output_profile (str): Profile the previous PDF was saved with
+            (default PDF_OUTPUT_PROFILE). Profiles that renumber objects
+            (small, archive) cannot be patched - see output_profiles.py
+    
+    Returns:
+        IncrementalPDF; (IncrementalPDF, FillReport) with with_report=True.
+        When the previous PDF no longer has the template's widgets at the
+        template's xrefs (a renumbering profile, a flattened or otherwise
+        rewritten file) the form is filled from scratch with
+        `output_profile` and returned with an empty prefix.
+    """
+    if renumbers_objects(output_profile):
+        return _refill(new_data, form_name, grey_out_calculated, need_appearances, with_report, output_profile)
+    
+    if isinstance(previous_pdf, IncrementalPDF):
+        previous_pdf = previous_pdf.tobytes()
+    
+    report = FillReport(form_name)
+    
+    with report.phase('plan'):
+        plan = get_fill_plan(form_name)
+        fields, taxpayer = changed_fields(old_data, new_data)
+        ops = _patch_ops(plan, fields, taxpayer)
+    
+    if not ops:
+        emit_report(report)
+        result = IncrementalPDF(previous_pdf, b'')
+        return (result, report) if with_report else result
+    
+    # Run the affected ops for both versions and keep only the differences
+    with report.phase('fill'):
+        before = WidgetWriteBatch()
+        _run_plan(ops, old_data, grey_out_calculated, before, FillReport(form_name))
+        after = WidgetWriteBatch()
+        _run_plan(ops, new_data, grey_out_calculated, after, report)
         
-        for json_field, pdf_field in taxpayer_mappings.items():
-            # Handle special combined fields
-            if json_field == 'full_name':
-                value = f"{taxpayer.get('first_name', '')} {taxpayer.get('last_name', '')}".strip()
-            elif json_field == 'property_address_1a':
-                parts = [taxpayer.get('address', ''), taxpayer.get('city', ''), 
-                        taxpayer.get('state', ''), taxpayer.get('zip', '')]
-                value = ', '.join([p for p in parts if p])
-            elif json_field == 'employer_name':
-                value = f"{taxpayer.get('first_name', '')} {taxpayer.get('last_name', '')}".strip()
-            else:
-                value = taxpayer.get(json_field, '')
+        batch = WidgetWriteBatch()
+        for xref in before.pending.keys() | after.pending.keys():
+            old = before.pending.get(xref)
+            new = after.pending.get(xref)
+            entry = (new or old).entry
             
-            if not value:
-                continue
+            old_value = old.value if old else None
+            new_value = new.value if new else None
+            if new_value != old_value:
+                if new_value is None:
+                    new_value = 'Off' if entry.field_type in BUTTON_TYPES else ''
+                batch.set_value(entry, new_value)
             
-            # Find and fill the PDF field (check both exact match and if full name contains it)
-            if pdf_field in field_map:
-                page, widget = field_map[pdf_field]
-                widget.field_value = str(value)
-                widget.update()
-                taxpayer_filled += 1
-            else:
-                # Try finding by checking if any full field name contains this
-                for full_name, (page, widget) in field_map.items():
-                    if full_name.endswith(pdf_field) or pdf_field in full_name:
-                        widget.field_value = str(value)
-                        widget.update()
-                        taxpayer_filled += 1
-                        break
-    
-    # ===== 3. FILL CHECKBOXES =====
-    if form_name in CHECKBOX_MAPPINGS:
-        checkbox_mappings = CHECKBOX_MAPPINGS[form_name]
+            old_read_only = bool(old and old.read_only)
+            new_read_only = bool(new and new.read_only)
+            if new_read_only and not old_read_only:
+                batch.set_read_only(entry)
+            elif old_read_only and not new_read_only:
+                batch.set_editable(entry)
+    
+    if not batch:
+        emit_report(report)
+        result = IncrementalPDF(previous_pdf, b'')
+        return (result, report) if with_report else result
+    
+    # saveIncr() appends to the file the document was opened from
+    fd, scratch_path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as scratch:
+            scratch.write(previous_pdf)
         
-        for json_field, pdf_field in checkbox_mappings.items():
-            # Handle filing_status (multi-option)
-            if json_field == 'filing_status' and isinstance(pdf_field, dict):
-                status_value = taxpayer.get('status_display', '').lower().replace(' ', '_')
-                if status_value in pdf_field:
-                    target_pdf_field = pdf_field[status_value]
-                    checkbox_value = "Yes"
-                    
-                    # Try exact match first
-                    if target_pdf_field in field_map:
-                        page, widget = field_map[target_pdf_field]
-                        widget.field_value = checkbox_value
-                        widget.update()
-                        checkbox_filled += 1
-                    else:
-                        # Try finding by checking if any full field name contains it
-                        for full_name, (page, widget) in field_map.items():
-                            if full_name.endswith(target_pdf_field) or target_pdf_field in full_name:
-                                widget.field_value = checkbox_value
-                                widget.update()
-                                checkbox_filled += 1
-                                break
-            elif not isinstance(pdf_field, dict):
-                # Simple checkbox
-                value = taxpayer.get(json_field)
-                if value is None and json_field in fields_data:
-                    value = fields_data[json_field].get('value', False)
-                
-                if value is not None:
-                    checkbox_value = "Yes" if value else "Off"
-                    
-                    # Try exact match first
-                    if pdf_field in field_map:
-                        page, widget = field_map[pdf_field]
-                        widget.field_value = checkbox_value
-                        widget.update()
-                        checkbox_filled += 1
+        with report.phase('open'):
+            doc = fitz.open(scratch_path)
+        try:
+            if not _matches_template(doc, [write.entry for write in batch.pending.values()]):
+                result = None
+            else:
+                with report.phase('commit'):
+                    batch.commit(doc, plan.index, need_appearances)
+                with report.phase('serialize'):
+                    if doc.can_save_incrementally():
+                        doc.saveIncr()
+                        result = False
                     else:
-                        # Try finding by checking if any full field name contains it
-                        for full_name, (page, widget) in field_map.items():
-                            if full_name.endswith(pdf_field) or pdf_field in full_name:
-                                widget.field_value = checkbox_value
-                                widget.update()
-                                checkbox_filled += 1
-                                break
-    
-    
-    # Debug info (optional - can be logged)
-    print(f"✅ Filled {filled_count} line items in {form_name}")
-    if taxpayer_filled > 0:
-        print(f"   👤 Filled {taxpayer_filled} taxpayer info fields")
-    if checkbox_filled > 0:
-        print(f"   ☑️  Filled {checkbox_filled} checkboxes")
-    if grey_count > 0:
-        print(f"   🔒 Greyed out {grey_count} calculated fields")
-    if skipped:
-        print(f"   ⚠️  Skipped {len(skipped)} fields (not found in PDF)")
-    
-    # Return PDF as bytes
-    pdf_bytes = doc.tobytes()
-    doc.close()
+                        result = IncrementalPDF(b'', doc.tobytes())
+        finally:
+            doc.close()
+        
+        if result is False:
+            with report.phase('serialize'), open(scratch_path, 'rb') as scratch:
+                scratch.seek(len(previous_pdf))
+                result = IncrementalPDF(previous_pdf, scratch.read())
+    finally:
+        os.remove(scratch_path)
     
-    return pdf_bytes
+    if result is None:
+        # Previous PDF does not match the template any more - full fill
+        return _refill(new_data, form_name, grey_out_calculated, need_appearances, with_report, output_profile)
+    
+    emit_report(report)
+    return (result, report) if with_report else result
+
+
+def _refill(data, form_name, grey_out_calculated, need_appearances, with_report, output_profile):
+    """patch_filled_pdf() fallback: a full fill returned with an empty prefix"""
+    pdf_bytes, report = fill_form_universal(data, form_name, grey_out_calculated, need_appearances,
+                                            with_report=True, output_profile=output_profile)
+    result = IncrementalPDF(b'', pdf_bytes)
+    return (result, report) if with_report else result
 
 
 def fill_form_1040(data, grey_out_calculated=True):
@@ -326,28 +769,12 @@ def fill_schedule(data, form_name, grey_out_calculated=True):
     return fill_form_universal(data, form_name, grey_out_calculated)
 
 
-def generate_form_pdf(form_instance):
+def form_name_and_data(form_instance):
     """
-    Main function to generate filled PDF for any form (Django integration)
-    
-    This is called by the Django view to generate PDFs with ACTUAL VALUES
+    Extract (form_name, data) from a Django model instance or plain dict
     
-    Args:
-        form_instance: Django model instance OR dict with:
-            - form_name: Form identifier (e.g., '1040', 'schedule_d')
-            - data: JSON field containing taxpayer and fields data with ACTUAL VALUES
-    
-    Returns:
-        bytes: PDF file content (filled with actual values, not field names)
-    
-    Example input data:
-        {
-            "taxpayer": {"first_name": "John", "last_name": "Doe", "ssn": "123-45-6789"},
-            "fields": {
-                "1a": {"value": "75000", "can_be_modified": true},  ← "75000" appears in PDF
-                "1z": {"value": "75000", "can_be_modified": false}  ← "75000" appears greyed
-            }
-        }
+    Raises:
+        ValueError: Unknown form ID or malformed data
     """
     # Handle both Django model instances and plain dicts
     if isinstance(form_instance, dict):
@@ -373,6 +800,274 @@ def generate_form_pdf(form_instance):
     if 'fields' not in data:
         raise ValueError("data missing 'fields' key")
     
+    return form_name, data
+
+
+def generate_form_pdf(form_instance, need_appearances=False, output=None, flatten=False):
+    """
+    Main function to generate filled PDF for any form (Django integration)
+    
+    This is called by the Django view to generate PDFs with ACTUAL VALUES
+    
+    Args:
+        form_instance: Django model instance OR dict with:
+            - form_name: Form identifier (e.g., '1040', 'schedule_d')
+            - data: JSON field containing taxpayer and fields data with ACTUAL VALUES
+        need_appearances (bool): See fill_form_universal()
+        output: See fill_form_universal()
+        flatten (bool): Print mode - values burned into the page, no form
+            fields (see fill_form_universal())
+    
+    Returns:
+        bytes: PDF file content (filled with actual values, not field names),
+            or `output` when one was given
+    
+    Example input data:
+        {
+            "taxpayer": {"first_name": "John", "last_name": "Doe", "ssn": "123-45-6789"},
+            "fields": {
+                "1a": {"value": "75000", "can_be_modified": true},  ← "75000" appears in PDF
+                "1z": {"value": "75000", "can_be_modified": false}  ← "75000" appears greyed
+            }
+        }
+    """
+    form_name, data = form_name_and_data(form_instance)
+    
     # Use universal filler to fill PDF with ACTUAL VALUES
-    return fill_form_universal(data, form_name)
+    return fill_form_universal(data, form_name, need_appearances=need_appearances, output=output, flatten=flatten)
+
+
+
+
+def filled_pdf_key(form_instance, need_appearances=False, flatten=False):
+    """
+    Content address of a form's filled PDF (also used as its HTTP ETag)
+    
+    Changes when the form data, the template, any mapping of the form or a
+    fill option changes - and ONLY then.
+    """
+    form_name, data = form_name_and_data(form_instance)
+    return cache_key(
+        get_fill_plan(form_name).fingerprint,
+        data,
+        grey_out_calculated=True,
+        need_appearances=need_appearances,
+        flatten=flatten,
+        output_profile=resolve_profile(),
+    )
+
+
+def generate_form_pdf_cached(form_instance, need_appearances=False, key=None, flatten=False):
+    """
+    generate_form_pdf() through the filled-PDF cache (see pdf_cache.py)
+    
+    Args:
+        form_instance: Same as generate_form_pdf()
+        need_appearances (bool): See fill_form_universal()
+        key (str): filled_pdf_key() if the caller already computed it
+        flatten (bool): See generate_form_pdf()
+    
+    Returns:
+        bytes: PDF file content (from the cache when the data is unchanged)
+    """
+    cache = get_pdf_cache()
+    if cache is None:
+        return generate_form_pdf(form_instance, need_appearances, flatten=flatten)
+    
+    if key is None:
+        key = filled_pdf_key(form_instance, need_appearances, flatten)
+    
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = generate_form_pdf(form_instance, need_appearances, flatten=flatten)
+        cache.set(key, pdf_bytes)
+    
+    return pdf_bytes
 
+
+def generate_form_pdf_stream(form_instance, need_appearances=False, key=None, max_memory=None, flatten=False):
+    """
+    Streaming variant of generate_form_pdf_cached()
+    
+    Returns:
+        Readable binary file object positioned at the start of the PDF
+        (hand it to Django's FileResponse, which closes it when done)
+    """
+    cache = get_pdf_cache()
+    if cache is not None:
+        if key is None:
+            key = filled_pdf_key(form_instance, need_appearances, flatten)
+        pdf_bytes = cache.get(key)
+        if pdf_bytes is not None:
+            return io.BytesIO(pdf_bytes)
+    
+    if max_memory is None:
+        max_memory = STREAM_MAX_MEMORY
+    
+    spool = generate_form_pdf(form_instance, need_appearances, output=open_pdf_spool(max_memory), flatten=flatten)
+    
+    if cache is not None:
+        # Copied without a second in-memory copy: the disk cache streams the
+        # spool in chunks; the memory cache (PDFs up to its entry limit)
+        # hands back its bytes, which are served instead of the spool
+        spool.seek(0)
+        cached = cache.set_file(key, spool)
+        if cached is not None:
+            spool.close()
+            return io.BytesIO(cached)
+    
+    spool.seek(0)
+    return spool
+
+
+# Attachment order inside a return packet (forms not listed follow in FORM_TEMPLATES order)
+PACKET_FORM_ORDER = [
+    '1040',
+    'schedule_1', 'schedule_2', 'schedule_3',
+    'schedule_a', 'schedule_b', 'schedule_c', 'schedule_d',
+    'schedule_e', 'schedule_f', 'schedule_h', 'schedule_se',
+]
+
+
+def _packet_sort_key(form_name):
+    if form_name in PACKET_FORM_ORDER:
+        return (0, PACKET_FORM_ORDER.index(form_name))
+    return (1, list(FORM_TEMPLATES).index(form_name) if form_name in FORM_TEMPLATES else len(FORM_TEMPLATES))
+
+
+# Field attributes a field inherits from its ancestors (PDF 32000-1, 12.7.3.1)
+_INHERITABLE_FIELD_KEYS = ('FT', 'Ff', 'V', 'DV', 'DA', 'Q', 'MaxLen')
+
+
+def _inherited_field_keys(doc, xref):
+    """(key, PDF value) of the inheritable attributes a field gets from its ancestors"""
+    inherited = []
+    for key in _INHERITABLE_FIELD_KEYS:
+        if doc.xref_get_key(xref, key)[0] != 'null':
+            continue
+        ancestor = xref
+        for _ in range(32):  # guards against /Parent cycles
+            kind, parent = doc.xref_get_key(ancestor, "Parent")
+            if kind != 'xref':
+                break
+            ancestor = int(parent.split()[0])
+            kind, value = doc.xref_get_key(ancestor, key)
+            if kind != 'null':
+                inherited.append((key, fitz.get_pdf_str(value) if kind == 'string' else value))
+                break
+    return inherited
+
+
+def _prefix_field_names(doc, prefix):
+    """
+    Make the field names of a filled document unique inside a return packet
+    
+    Every IRS template uses the same roots (e.g. "topmostSubform[0]"), so
+    merged forms would share field names and overwrite each other's values.
+    insert_pdf() also lists the DIRECT parent of every widget as a top-level
+    field and appends " [xref]" to every one whose /T is already taken
+    ("Page1[0]" of the next form, "Dependent1[0]" of the next row). So each
+    direct parent is detached from its ancestors and takes its full name,
+    prefixed: widget names stay "<prefix>topmostSubform[0].Page1[0].f1_1[0]"
+    and no two top-level fields of the packet share a /T.
+    """
+    parents = {}  # direct parent xref → its widget xrefs
+    orphans = []  # widgets that are top-level fields themselves
+    for page in doc:
+        for xref, annot_type, _ in page.annot_xrefs():
+            if annot_type != fitz.PDF_ANNOT_WIDGET:
+                continue
+            kind, parent = doc.xref_get_key(xref, "Parent")
+            if kind == 'xref':
+                parents.setdefault(int(parent.split()[0]), set()).add(xref)
+            else:
+                orphans.append(xref)
+    
+    # Read every name before changing any: detaching a parent renames the fields below it
+    renamed = {xref: (_full_field_name(doc, xref), _inherited_field_keys(doc, xref)) for xref in parents}
+    
+    for xref, (name, inherited) in renamed.items():
+        for key, value in inherited:
+            doc.xref_set_key(xref, key, value)
+        # Keep the widget kids (in their order); nested fields are detached too
+        kind, kids = doc.xref_get_key(xref, "Kids")
+        kids = [int(ref) for ref in kids[1:-1].split()[::3] if ref.isdigit()] if kind == 'array' else []
+        kids = [kid for kid in kids if kid in parents[xref]]
+        doc.xref_set_key(xref, "Kids", "[" + " ".join(f"{kid} 0 R" for kid in kids) + "]")
+        doc.xref_set_key(xref, "Parent", "null")
+        doc.xref_set_key(xref, "T", fitz.get_pdf_str(f"{prefix}{name}"))
+    
+    for xref in orphans:
+        kind, name = doc.xref_get_key(xref, "T")
+        if kind == 'string':
+            doc.xref_set_key(xref, "T", fitz.get_pdf_str(f"{prefix}{name}"))
+    
+    fields = "[" + " ".join(f"{xref} 0 R" for xref in list(renamed) + orphans) + "]"
+    catalog = doc.pdf_catalog()
+    kind, acroform = doc.xref_get_key(catalog, "AcroForm")
+    if kind == 'xref':  # the IRS templates use an indirect AcroForm
+        doc.xref_set_key(int(acroform.split()[0]), "Fields", fields)
+    elif kind == 'dict':
+        doc.xref_set_key(catalog, "AcroForm/Fields", fields)
+
+
+def generate_return_packet(form_instances, grey_out_calculated=True, need_appearances=False, output=None,
+                           output_profile=None):
+    """
+    Fill several forms of one return and merge them into ONE PDF
+    
+    Every form is filled with the same fill plans as generate_form_pdf(),
+    its field names are prefixed with the form name so they cannot collide
+    (e.g. "schedule_a_topmostSubform[0].Page1[0].f1_1[0]"), and the merged
+    document is serialized once.
+    
+    Args:
+        form_instances: Iterable of Django model instances OR dicts
+            (same shape as generate_form_pdf() accepts)
+        grey_out_calculated (bool): If True, grey out fields where can_be_modified=False
+        need_appearances (bool): See fill_form_universal()
+        output: See fill_form_universal()
+        output_profile (str): See fill_form_universal(). 'archive' also
+            merges the fonts every form of the packet embeds.
+    
+    Returns:
+        bytes: PDF file content (1040 first, then schedules, then other forms),
+            or `output` when one was given
+    """
+    forms = [form_name_and_data(form_instance) for form_instance in form_instances]
+    if not forms:
+        raise ValueError("No forms to include in the return packet")
+    
+    # Stable sort: several copies of a form (e.g. two Schedule C) keep their order
+    forms.sort(key=lambda form: _packet_sort_key(form[0]))
+    options = save_options(output_profile)
+    
+    packet = fitz.open()
+    seen = {}
+    try:
+        for form_name, data in forms:
+            copy_number = seen.get(form_name, 0) + 1
+            seen[form_name] = copy_number
+            prefix = form_name if copy_number == 1 else f"{form_name}_{copy_number}"
+            
+            doc, report = _fill_document(data, form_name, grey_out_calculated, need_appearances)
+            try:
+                _prefix_field_names(doc, f"{prefix}_")
+                packet.insert_pdf(doc)
+            finally:
+                doc.close()
+            
+            # Per-form reports have no 'serialize' phase (the packet is saved once)
+            emit_report(report)
+        
+        if need_appearances:
+            # The per-form flag lives in each source catalog, which is not copied
+            packet.need_appearances(True)
+        
+        if output is not None:
+            packet.save(_SaveTarget(output), **options)
+            return output
+        
+        return packet.tobytes(**options)
+    finally:
+        packet.close()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Background Pre-rendering for the PDF Filler
+Fills a form's PDF when its data is SAVED, so opening it is a cache hit
+
+ARCHITECTURE:
+- Trigger: connect_prerender(FormModel) hooks Django's post_save signal.
+  A save that touches `data` enqueues the form plus its dependent forms
+  (e.g. the 1040 when Schedule 1 changes - you supply `dependents`).
+- Backend (pluggable):
+    * RenderPoolBackend (default): fills in the bounded render pool
+      (render_pool.py) and stores the PDF in the filled-PDF cache
+      (pdf_cache.py). Pre-rendering has its own in-flight limit in the
+      pool; jobs over it (or over the pool's queue depth) wait in a
+      bounded backlog and are submitted as slots free up. Only a full
+      backlog drops jobs (logged as a warning) - the view then simply
+      fills on request, as before.
+    * SyncBackend: fills immediately in the saving thread (scripts, tests)
+    * Anything with enqueue(form_instances) - e.g. a Celery task wrapper
+- TaxpayerFormPDFView already reads the cache first and falls back to a
+  synchronous fill on a miss, so no view change is needed.
+
+USAGE (your app's apps.py):
+    def ready(self):
+        from .models import Form
+        from .prerender import connect_prerender
+        connect_prerender(Form, dependents=lambda form: form.linked_forms())
+
+CONFIGURATION (environment):
+    PDF_PRERENDER_CONCURRENCY  Pre-render fills in flight (default: render pool workers)
+    PDF_PRERENDER_BACKLOG      Pre-render jobs allowed to wait (default: 500)
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+
+try:
+    from .pdf_filler import filled_pdf_key, form_name_and_data, generate_form_pdf
+    from .pdf_cache import get_pdf_cache
+    from .render_pool import RenderPoolSaturated, get_render_pool
+except ImportError:
+    # Standalone mode (not in Django)
+    from pdf_filler import filled_pdf_key, form_name_and_data, generate_form_pdf
+    from pdf_cache import get_pdf_cache
+    from render_pool import RenderPoolSaturated, get_render_pool
+
+logger = logging.getLogger('pdf_filler')
+
+# Render pool "user" that pre-render jobs are accounted under
+PRERENDER_USER = '__prerender__'
+
+PRERENDER_CONCURRENCY = int(os.environ.get('PDF_PRERENDER_CONCURRENCY', 0)) or None
+PRERENDER_BACKLOG = int(os.environ.get('PDF_PRERENDER_BACKLOG', 500))
+
+
+def _pending(form_instances):
+    """(form_instance, key) for every form whose PDF is not cached yet"""
+    cache = get_pdf_cache()
+    if cache is None:
+        return []
+
+    pending = []
+    for form_instance in form_instances:
+        key = filled_pdf_key(form_instance)
+        if cache.get(key) is None:
+            pending.append((form_instance, key))
+    return pending
+
+
+class SyncBackend:
+    """Pre-render in the calling thread"""
+
+    def enqueue(self, form_instances):
+        cache = get_pdf_cache()
+        for form_instance, key in _pending(form_instances):
+            cache.set(key, generate_form_pdf(form_instance))
+
+
+class RenderPoolBackend:
+    """
+    Pre-render in the shared render pool
+
+    Jobs the pool cannot admit right now wait in a bounded backlog and are
+    submitted when a pre-render finishes (or after the pool's Retry-After).
+    """
+
+    def __init__(self, concurrency=PRERENDER_CONCURRENCY, backlog=PRERENDER_BACKLOG):
+        self.concurrency = concurrency
+        self.backlog = backlog
+        self._lock = threading.Lock()
+        self._queue = deque()    # (form_name, data, key)
+        self._queued = set()     # keys in the queue
+        self._retry = None
+
+    def enqueue(self, form_instances):
+        dropped = []
+        with self._lock:
+            for form_instance, key in _pending(form_instances):
+                if key in self._queued:
+                    continue
+                form_name, data = form_name_and_data(form_instance)
+                if len(self._queue) >= self.backlog:
+                    dropped.append(form_name)
+                    continue
+                self._queue.append((form_name, data, key))
+                self._queued.add(key)
+
+        if dropped:
+            logger.warning("Pre-render backlog full (%d jobs): dropped %s", self.backlog, ', '.join(dropped))
+        self._drain()
+
+    def pending(self):
+        """Jobs waiting for a render pool slot"""
+        with self._lock:
+            return len(self._queue)
+
+    def _drain(self):
+        """Submit queued jobs until the pool refuses one"""
+        pool = get_render_pool()
+        pool.set_user_limit(PRERENDER_USER, self.concurrency or pool.workers)
+        cache = get_pdf_cache()
+
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                form_name, data, key = self._queue[0]
+                try:
+                    future = pool.submit(PRERENDER_USER, data, form_name)
+                except RenderPoolSaturated as e:
+                    self._schedule_retry(e.retry_after)
+                    return
+                self._queue.popleft()
+                self._queued.discard(key)
+            future.add_done_callback(self._store_callback(cache, key, form_name))
+
+    def _schedule_retry(self, delay):
+        # Called with self._lock held. Completions also drain; the timer
+        # covers a pool kept full by interactive requests alone.
+        if self._retry is None or not self._retry.is_alive():
+            self._retry = threading.Timer(delay, self._drain)
+            self._retry.daemon = True
+            self._retry.start()
+
+    def _store_callback(self, cache, key, form_name):
+        def store(future):
+            try:
+                cache.set(key, future.result())
+            except Exception:
+                logger.exception("Pre-render of %s failed", form_name)
+            self._drain()
+        return store
+
+
+_BACKEND = RenderPoolBackend()
+
+
+def get_prerender_backend():
+    return _BACKEND
+
+
+def set_prerender_backend(backend):
+    """Replace the pre-render backend (any object with enqueue(form_instances))"""
+    global _BACKEND
+    _BACKEND = backend
+
+
+def prerender(form_instances):
+    """Queue PDF fills for these forms (skips forms already cached)"""
+    _BACKEND.enqueue(list(form_instances))
+
+
+def connect_prerender(model, dependents=None):
+    """
+    Pre-render a model's PDFs whenever its `data` is saved
+
+    Args:
+        model: Django model class of the form instances
+        dependents: Optional callable(form_instance) → iterable of OTHER form
+            instances whose PDF must be refreshed too (e.g. the 1040 that
+            receives this schedule's totals)
+
+    Returns:
+        The signal receiver (keep it if you want to disconnect later)
+    """
+    from django.db import transaction
+    from django.db.models.signals import post_save
+
+    def receiver(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and 'data' not in update_fields:
+            return
+
+        forms = [instance]
+        if dependents is not None:
+            forms.extend(dependents(instance))
+
+        def run():
+            try:
+                prerender(forms)
+            except Exception:
+                # A pre-render problem must never fail the save
+                logger.exception("Pre-render after saving %s failed", instance)
+
+        # Wait for the commit so the pool never renders uncommitted data
+        transaction.on_commit(run)
+
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f"pdf_prerender_{model.__name__}")
+    return receiver
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Per-Request Profiling for the PDF Filler
+Opt-in phase timings and cProfile dumps for fill_form_universal/generate_form_pdf
+
+ARCHITECTURE:
+- profile_fills(): context manager that enables profiling for the CURRENT
+  request/task only (contextvars - concurrent requests are unaffected).
+  Every FillReport emitted inside it is collected; with dump_dir set the
+  block also runs under cProfile and the stats are written to disk
+  (open with snakeviz, or convert to a flamegraph with flameprof).
+- Render pool fills (async view) run in other processes: the worker
+  returns its FillReport and render_pool.py emits it in the submitting
+  request's context, so they are collected too (cProfile dumps only cover
+  the web process). Pre-render fills are background work and only land in
+  a session when they finish before the saving request ends.
+- PDFProfilingMiddleware: Django middleware that records every fill into
+  a process-wide "slowest forms" table, and for staff users sending the
+  X-PDF-Profile header adds a Server-Timing header (and a cProfile dump
+  with "X-PDF-Profile: cprofile"). The staff check runs AFTER the view,
+  once DRF has authenticated the request (token auth included).
+
+SETTINGS (optional):
+    PDF_PROFILE_DIR   Directory for .prof dumps (default: no dumps)
+
+USAGE:
+    MIDDLEWARE = [..., 'your_app.profiling.PDFProfilingMiddleware']
+
+    from .profiling import slowest_forms
+    slowest_forms(10)   # [{'form_name': '3800', 'max_ms': ..., 'avg_ms': ...}, ...]
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import contextvars
+import cProfile
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    from .fill_report import add_metrics_hook
+except ImportError:
+    # Standalone mode (not in Django)
+    from fill_report import add_metrics_hook
+
+# Active ProfileSession of the current request (None = not profiling)
+_SESSION = contextvars.ContextVar('pdf_filler_profile', default=None)
+
+
+class ProfileSession:
+    """
+    Fill reports collected inside one profile_fills() block
+
+    Attributes:
+        reports (list): FillReport per fill, in order
+        dump_path (str): cProfile stats file (None unless dump_dir was given)
+        keep_dump (bool): Set to False inside the block to skip writing the dump
+    """
+
+    def __init__(self):
+        self.reports = []
+        self.dump_path = None
+        self.keep_dump = True
+
+    def phase_totals(self):
+        """phase → seconds summed over every fill of the block"""
+        totals = {}
+        for report in self.reports:
+            for phase, seconds in report.timings.items():
+                totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+    def server_timing(self):
+        """Value for an HTTP Server-Timing header"""
+        return ', '.join(
+            f"pdf-{phase};dur={seconds * 1000:.1f}"
+            for phase, seconds in self.phase_totals().items()
+        )
+
+
+@contextmanager
+def profile_fills(dump_dir=None, label='pdf_fill'):
+    """
+    Profile every fill in this block (this request/task only)
+
+    Args:
+        dump_dir (str): Also run the block under cProfile and write
+            <dump_dir>/<label>-<timestamp>-<pid>-<unique id>.prof
+        label (str): Dump file prefix (e.g. the form name or URL)
+
+    Yields:
+        ProfileSession
+    """
+    session = ProfileSession()
+    token = _SESSION.set(session)
+    profiler = cProfile.Profile() if dump_dir else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield session
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            if session.keep_dump:
+                os.makedirs(dump_dir, exist_ok=True)
+                name = f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}.prof"
+                session.dump_path = os.path.join(dump_dir, name)
+                profiler.dump_stats(session.dump_path)
+        _SESSION.reset(token)
+
+
+def _collect(report):
+    """Metrics hook: hand the report to the active session, if any"""
+    session = _SESSION.get()
+    if session is not None:
+        session.reports.append(report)
+
+
+add_metrics_hook(_collect)
+
+
+# ===== SLOWEST FORMS =====
+
+# form_name → [count, total seconds, max seconds]
+_FORM_TIMES = {}
+_FORM_TIMES_LOCK = threading.Lock()
+
+
+def record_form_times(reports):
+    with _FORM_TIMES_LOCK:
+        for report in reports:
+            stats = _FORM_TIMES.setdefault(report.form_name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += report.total
+            stats[2] = max(stats[2], report.total)
+
+
+def slowest_forms(limit=10):
+    """Forms with the highest worst-case fill time in this process"""
+    with _FORM_TIMES_LOCK:
+        rows = [
+            {
+                'form_name': form_name,
+                'count': count,
+                'avg_ms': round(total / count * 1000, 2),
+                'max_ms': round(worst * 1000, 2),
+            }
+            for form_name, (count, total, worst) in _FORM_TIMES.items()
+        ]
+    rows.sort(key=lambda row: row['max_ms'], reverse=True)
+    return rows[:limit]
+
+
+def reset_form_times():
+    with _FORM_TIMES_LOCK:
+        _FORM_TIMES.clear()
+
+
+# ===== DJANGO MIDDLEWARE =====
+
+class PDFProfilingMiddleware:
+    """
+    Collect fill timings per request; expose them to staff on demand
+
+    Request header (staff users only):
+        X-PDF-Profile: 1          → Server-Timing header with phase totals
+        X-PDF-Profile: cprofile   → also a cProfile dump in PDF_PROFILE_DIR
+    """
+
+    def __init__(self, get_response):
+        from django.conf import settings
+
+        self.get_response = get_response
+        self.dump_dir = getattr(settings, 'PDF_PROFILE_DIR', None)
+
+    def __call__(self, request):
+        requested = request.headers.get('X-PDF-Profile', '')
+        dump_dir = self.dump_dir if requested == 'cprofile' else None
+
+        with profile_fills(dump_dir, label='request') as session:
+            response = self.get_response(request)
+            # DRF authenticates inside the view (and sets request.user then),
+            # so the user is only known here - not before get_response()
+            user = getattr(request, 'user', None)
+            staff = bool(requested) and getattr(user, 'is_staff', False)
+            session.keep_dump = staff
+
+        if session.reports:
+            record_form_times(session.reports)
+            if staff:
+                response['Server-Timing'] = session.server_timing()
+                if session.dump_path:
+                    response['X-PDF-Profile-Dump'] = os.path.basename(session.dump_path)
+
+        return response
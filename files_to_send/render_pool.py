@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Bounded Render Pool for the PDF Filler
+Runs fills off the request thread with hard limits instead of unbounded queueing
+
+ARCHITECTURE:
+- A ProcessPoolExecutor does the PyMuPDF work (PyMuPDF is not thread-safe,
+  and processes keep the GIL-bound fill off the web workers). Each worker
+  compiles every fill plan once when it starts.
+- The worker returns its FillReport with the PDF; the report is emitted
+  in the web process, in the context of the submitting request, so metrics
+  hooks and per-request profiling (profiling.py) see pool fills too.
+- Admission control BEFORE anything is queued:
+    * queue depth: at most PDF_RENDER_WORKERS + PDF_RENDER_QUEUE fills in flight
+    * per user:    at most PDF_RENDER_PER_USER fills in flight per user
+  A fill over either limit raises RenderPoolSaturated at once, so the view
+  can answer 503 + Retry-After instead of pinning the server.
+
+CONFIGURATION (environment):
+    PDF_RENDER_WORKERS      Worker processes (default: CPU count)
+    PDF_RENDER_QUEUE        Extra fills allowed to wait (default: 2 per worker)
+    PDF_RENDER_PER_USER     Fills in flight per user (default: 2)
+    PDF_RENDER_RETRY_AFTER  Seconds suggested to saturated clients (default: 2)
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+try:
+    from .pdf_filler import fill_form_universal, get_fill_plan
+    from .form_mappings_complete import FORM_TEMPLATES
+    from .fill_report import emit_report
+except ImportError:
+    # Standalone mode (not in Django)
+    from pdf_filler import fill_form_universal, get_fill_plan
+    from form_mappings_complete import FORM_TEMPLATES
+    from fill_report import emit_report
+
+
+class RenderPoolSaturated(Exception):
+    """The pool (or this user's share of it) is full - retry later"""
+
+    def __init__(self, reason, retry_after):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"PDF render pool saturated ({reason}), retry after {retry_after}s")
+
+
+def _init_worker():
+    """Compile every fill plan once per worker process"""
+    for form_name in FORM_TEMPLATES:
+        try:
+            get_fill_plan(form_name)
+        except (ValueError, FileNotFoundError):
+            # Reported when that form is actually requested
+            pass
+
+
+def _fill(data, form_name, fill_options):
+    """Worker: (pdf_bytes, FillReport) for one fill"""
+    return fill_form_universal(data, form_name, with_report=True, **fill_options)
+
+
+class RenderPool:
+    """
+    Process pool with queue-depth and per-user admission limits
+
+    Usage:
+        future = pool.submit(user_id, data, form_name)   # may raise RenderPoolSaturated
+        pdf_bytes = future.result()                        # or await asyncio.wrap_future(future)
+    """
+
+    def __init__(self, workers=None, queue=None, per_user=2, retry_after=2):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = self.workers + (self.workers * 2 if queue is None else queue)
+        self.per_user = per_user
+        self.retry_after = retry_after
+        # user_key → in-flight limit replacing per_user (e.g. pre-rendering)
+        self.user_limits = {}
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._per_user = {}
+
+    def _get_executor(self):
+        # Created lazily so importing this module never forks processes
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._executor
+
+    def _admit(self, user_key):
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise RenderPoolSaturated('queue full', self.retry_after)
+            if self._per_user.get(user_key, 0) >= self.user_limits.get(user_key, self.per_user):
+                raise RenderPoolSaturated('per-user limit', self.retry_after)
+            self._in_flight += 1
+            self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+
+    def _release(self, user_key):
+        with self._lock:
+            self._in_flight -= 1
+            remaining = self._per_user.get(user_key, 1) - 1
+            if remaining:
+                self._per_user[user_key] = remaining
+            else:
+                self._per_user.pop(user_key, None)
+
+    def set_user_limit(self, user_key, limit):
+        """Give one user key its own in-flight limit (the queue-depth limit still applies)"""
+        with self._lock:
+            self.user_limits[user_key] = limit
+
+    def submit(self, user_key, data, form_name, **fill_options):
+        """
+        Queue one fill_form_universal() call
+
+        Args:
+            user_key: Anything hashable identifying the requester (user id, IP)
+            data (dict): Form data (taxpayer + fields)
+            form_name (str): Form identifier
+            **fill_options: Passed to fill_form_universal()
+
+        Returns:
+            concurrent.futures.Future resolving to the PDF bytes
+
+        Raises:
+            RenderPoolSaturated: Queue depth or per-user limit reached
+        """
+        self._admit(user_key)
+        context = contextvars.copy_context()
+        try:
+            worker_future = self._get_executor().submit(_fill, data, form_name, fill_options)
+        except Exception:
+            self._release(user_key)
+            raise
+
+        # Resolved only after the report was emitted, so a request that
+        # waits for the PDF also finds the fill in its profile
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def done(worker_future):
+            self._release(user_key)
+            try:
+                pdf_bytes, report = worker_future.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            context.run(emit_report, report)
+            future.set_result(pdf_bytes)
+
+        worker_future.add_done_callback(done)
+        return future
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'in_flight': self._in_flight,
+                'max_in_flight': self.max_in_flight,
+                'users': len(self._per_user),
+            }
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def _pool_from_environment():
+    queue = os.environ.get('PDF_RENDER_QUEUE')
+    return RenderPool(
+        workers=int(os.environ.get('PDF_RENDER_WORKERS', 0)) or None,
+        queue=int(queue) if queue is not None else None,
+        per_user=int(os.environ.get('PDF_RENDER_PER_USER', 2)),
+        retry_after=int(os.environ.get('PDF_RENDER_RETRY_AFTER', 2)),
+    )
+
+
+_RENDER_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_render_pool():
+    """Process-wide RenderPool (configured from the environment on first use)"""
+    global _RENDER_POOL
+    if _RENDER_POOL is None:
+        with _POOL_LOCK:
+            if _RENDER_POOL is None:
+                _RENDER_POOL = _pool_from_environment()
+    return _RENDER_POOL
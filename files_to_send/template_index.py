@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Template Widget Index for the PDF Filler
+Precompiled, cached index of every form widget in the blank IRS templates
+
+ARCHITECTURE:
+- Input: Blank PDF template from FORM_TEMPLATES (e.g., 'f1040.pdf')
+- Process: Walks page.widgets() ONCE and records name → page, xref, type, rect, on-state
+- Output: TemplateIndex cached in-process and persisted to disk (keyed by template hash)
+
+With the index, a fill loads only the widgets it actually writes
+(page.load_widget(xref)) instead of enumerating every widget on every page.
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+import fitz  # PyMuPDF
+
+# Bump when the on-disk index layout changes (old cache files are ignored)
+INDEX_FORMAT_VERSION = 1
+
+# Directory for persisted indexes (override with PDF_INDEX_CACHE_DIR)
+# Defaults to a hidden folder next to this file (same place as the templates)
+INDEX_CACHE_DIR = os.environ.get(
+    'PDF_INDEX_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pdf_index_cache'),
+)
+
+# One widget of a blank template
+#   name:        full field name (e.g., "topmostSubform[0].Page1[0].f1_47[0]")
+#   page:        0-based page number
+#   xref:        PDF object number of the widget annotation
+#   field_type:  fitz.PDF_WIDGET_TYPE_* constant
+#   rect:        (x0, y0, x1, y1) on the page
+#   on_state:    "On" appearance name for checkboxes/radio buttons, else None
+WidgetEntry = namedtuple('WidgetEntry', 'name page xref field_type rect on_state')
+
+BUTTON_TYPES = (fitz.PDF_WIDGET_TYPE_CHECKBOX, fitz.PDF_WIDGET_TYPE_RADIOBUTTON)
+
+
+class AmbiguousFieldError(LookupError):
+    """A mapping name matches more than one distinct widget in a template"""
+
+    def __init__(self, name, candidates):
+        self.name = name
+        self.candidates = tuple(candidates)
+        super().__init__(
+            f"Ambiguous PDF field '{name}': matches {len(self.candidates)} widgets "
+            f"({', '.join(self.candidates)})"
+        )
+
+
+class TemplateIndex:
+    """
+    Compiled widget index for ONE blank template
+
+    Name resolution (every lookup is a dict hit, O(len(name)) to hash):
+    - Full path:  "topmostSubform[0].Page1[0].f1_47[0]"
+    - Dotted suffix: every trailing run of segments, e.g. "f1_47[0]" (last
+      segment) or "Checkbox_ReadOrder[0].c1_8[1]". This is the suffix trie
+      over the dotted segments, flattened into one dict.
+
+    A suffix shared by several distinct widgets is AMBIGUOUS. resolve() then
+    picks the LAST candidate in document order - the same widget the old
+    per-request field_map returned for a short name - and the ambiguity is
+    reported (or raised with strict=True) instead of silently taking
+    whichever substring scan hit came first.
+    """
+
+    def __init__(self, template_path, template_hash, entries):
+        self.template_path = template_path
+        self.template_hash = template_hash
+        self.entries = tuple(entries)
+
+        # Full name → entry (last widget wins for multi-widget fields)
+        self.by_name = {}
+        # Dotted suffix → distinct full names, in document order
+        suffixes = {}
+        for entry in self.entries:
+            if entry.name not in self.by_name:
+                segments = entry.name.split('.')
+                for i in range(len(segments)):
+                    suffixes.setdefault('.'.join(segments[i:]), []).append(entry.name)
+            self.by_name[entry.name] = entry
+
+        self.suffixes = {suffix: tuple(names) for suffix, names in suffixes.items()}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return self.resolve(name) is not None
+
+    def candidates(self, name):
+        """All distinct full names a mapping name can refer to (document order)"""
+        if not name:
+            return ()
+        if name in self.by_name:
+            return (name,)
+        return self.suffixes.get(name, ())
+
+    def is_ambiguous(self, name):
+        return len(self.candidates(name)) > 1
+
+    def resolve(self, name, strict=False):
+        """
+        Resolve a mapping name (full path or dotted suffix) to a WidgetEntry
+
+        Args:
+            name (str): PDF field name from form_mappings_complete.py
+            strict (bool): Raise AmbiguousFieldError instead of picking the
+                last candidate when the name matches several widgets
+
+        Returns:
+            WidgetEntry, or None if nothing matches (including empty names)
+        """
+        candidates = self.candidates(name)
+        if not candidates:
+            return None
+        if strict and len(candidates) > 1:
+            raise AmbiguousFieldError(name, candidates)
+        return self.by_name[candidates[-1]]
+
+    def load_widget(self, doc, entry, pages):
+        """
+        Load the live widget for an entry from an open document
+
+        Only this widget is instantiated - the rest of the page is untouched.
+
+        Args:
+            doc: Open fitz.Document of this template
+            entry: WidgetEntry from this index
+            pages (dict): Caller-owned page_num → Page cache. Pages must stay
+                referenced while widgets are written, otherwise PyMuPDF raises
+                "not bound to page" on widget.update().
+        """
+        page = pages.get(entry.page)
+        if page is None:
+            page = pages[entry.page] = doc[entry.page]
+        return page.load_widget(entry.xref)
+
+    def to_dict(self):
+        return {
+            'version': INDEX_FORMAT_VERSION,
+            'template_hash': self.template_hash,
+            'entries': [list(entry) for entry in self.entries],
+        }
+
+    @classmethod
+    def from_dict(cls, template_path, payload):
+        entries = [
+            WidgetEntry(name, page, xref, field_type, tuple(rect), on_state)
+            for name, page, xref, field_type, rect, on_state in payload['entries']
+        ]
+        return cls(template_path, payload['template_hash'], entries)
+
+
+# ===== BUILDING =====
+
+def hash_template(template_path):
+    """SHA-256 of the template file (hex) - the disk cache key"""
+    digest = hashlib.sha256()
+    with open(template_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_template_index(template_path, template_hash=None):
+    """
+    Walk every widget of a blank template and build its TemplateIndex
+
+    This is the expensive step (full widget enumeration). It runs once per
+    template file; afterwards the index comes from memory or disk.
+    """
+    if template_hash is None:
+        template_hash = hash_template(template_path)
+
+    entries = []
+    doc = fitz.open(template_path)
+    try:
+        for page_num in range(doc.page_count):
+            page = doc[page_num]
+            for widget in page.widgets():
+                if not widget.field_name:
+                    continue
+                on_state = None
+                if widget.field_type in BUTTON_TYPES:
+                    on_state = widget.on_state()
+                    if on_state is True:  # new button without an "On" name
+                        on_state = None
+                entries.append(WidgetEntry(
+                    widget.field_name,
+                    page_num,
+                    widget.xref,
+                    widget.field_type,
+                    tuple(widget.rect),
+                    on_state,
+                ))
+    finally:
+        doc.close()
+
+    return TemplateIndex(template_path, template_hash, entries)
+
+
+# ===== DISK CACHE =====
+
+def _cache_file(template_path, template_hash):
+    base = os.path.splitext(os.path.basename(template_path))[0]
+    return os.path.join(INDEX_CACHE_DIR, f"{base}-{template_hash[:16]}.json")
+
+
+def _load_from_disk(template_path, template_hash):
+    path = _cache_file(template_path, template_hash)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if payload.get('version') != INDEX_FORMAT_VERSION:
+        return None
+    if payload.get('template_hash') != template_hash:
+        return None
+    return TemplateIndex.from_dict(template_path, payload)
+
+
+def _save_to_disk(index):
+    """Persist an index (best effort - a read-only deploy just skips it)"""
+    path = _cache_file(index.template_path, index.template_hash)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+# ===== IN-PROCESS CACHE =====
+
+# template_path → ((mtime_ns, size), TemplateIndex)
+_INDEX_CACHE = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def get_template_index(template_path):
+    """
+    Return the TemplateIndex for a template (memory → disk → build)
+
+    The in-process entry is revalidated with a single stat() so a replaced
+    template (new IRS revision) is picked up without a restart. The disk
+    cache is keyed by the template's content hash.
+    """
+    stat = os.stat(template_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _INDEX_CACHE.get(template_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(template_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        template_hash = hash_template(template_path)
+        index = _load_from_disk(template_path, template_hash)
+        if index is None:
+            index = build_template_index(template_path, template_hash)
+            _save_to_disk(index)
+
+        _INDEX_CACHE[template_path] = (signature, index)
+        return index
+
+
+def clear_template_index_cache():
+    """Drop all in-process indexes (disk cache is left alone)"""
+    with _INDEX_LOCK:
+        _INDEX_CACHE.clear()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Template Byte Store for the PDF Filler
+Memory-mapped, read-only bytes of the blank IRS templates
+
+ARCHITECTURE:
+- Input: Template path from FORM_TEMPLATES
+- Process: mmap()s the file ONCE per process; the OS page cache backs every
+  mapping, so all workers on a host share one physical copy
+- Output: Read-only mmap object (slice it or wrap it in memoryview() - no copy)
+  and open_template(): a fresh fitz.Document parsed from an in-memory copy
+  of the template - no file open or disk read on the request path
+
+A replaced template (new IRS revision) is picked up on the next call: the
+entry is revalidated with one stat() just like the widget index cache.
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import mmap
+import os
+import threading
+
+import fitz  # PyMuPDF
+
+# template_path → ((mtime_ns, size), mmap)
+_TEMPLATE_BYTES = {}
+# template_path → (mmap it was copied from, bytes) - what fitz.open(stream=...) reads
+_TEMPLATE_BLOBS = {}
+_STORE_LOCK = threading.Lock()
+
+
+def get_template_bytes(template_path):
+    """Return the read-only memory map of a template file"""
+    stat = os.stat(template_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _TEMPLATE_BYTES.get(template_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _STORE_LOCK:
+        cached = _TEMPLATE_BYTES.get(template_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(template_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The old map is left to the garbage collector: responses that are
+        # still streaming a memoryview of it keep it alive until they finish
+        _TEMPLATE_BYTES[template_path] = (signature, mapped)
+        return mapped
+
+
+def get_template_blob(template_path):
+    """
+    Template content as an immutable bytes object (one copy per worker)
+
+    PyMuPDF only opens streams from bytes-like buffers it can keep, so the
+    map is copied ONCE and the copy is reused by every open_template() call.
+    """
+    mapped = get_template_bytes(template_path)
+
+    cached = _TEMPLATE_BLOBS.get(template_path)
+    if cached is not None and cached[0] is mapped:
+        return cached[1]
+
+    blob = bytes(mapped)
+    _TEMPLATE_BLOBS[template_path] = (mapped, blob)
+    return blob
+
+
+def open_template(template_path):
+    """
+    Open a pristine copy of a template from memory
+
+    PyMuPDF documents cannot be cloned or reset once widgets were written,
+    so every fill still gets its own Document - but it is parsed from the
+    cached bytes (MuPDF loads objects lazily, only the xref is read up
+    front) instead of re-opening and re-reading the file in TEMPLATE_DIR.
+    """
+    return fitz.open(stream=get_template_blob(template_path), filetype='pdf')
+
+
+def clear_template_bytes():
+    """Forget every mapped template (maps close once no view references them)"""
+    with _STORE_LOCK:
+        _TEMPLATE_BYTES.clear()
+        _TEMPLATE_BLOBS.clear()
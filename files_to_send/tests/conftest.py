@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Tests import the filler modules in standalone mode (not in Django)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import django
+    from django.conf import settings
+except ImportError:
+    django = None
+
+try:
+    import rest_framework
+except ImportError:
+    rest_framework = None
+
+# One settings object for every test module that needs Django
+if django is not None and not settings.configured:
+    settings.configure(
+        DEBUG=True,
+        SECRET_KEY='tests',
+        ALLOWED_HOSTS=['*'],
+        INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth']
+        + (['rest_framework'] if rest_framework is not None else []),
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        REST_FRAMEWORK={'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated']},
+    )
+    django.setup()
@@ -0,0 +1,60 @@
+"""
+TaxpayerFormPDFAsyncView must enforce the same DRF auth as TaxpayerFormPDFView
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+django = pytest.importorskip('django')
+pytest.importorskip('rest_framework')
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+# views.py uses package-relative imports: load it as files_to_send.views
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from files_to_send import views  # noqa: E402
+
+from benchmark_filler import synthetic_data  # noqa: E402
+
+URL = '/api/v1/taxpayer/40/render/pdf-async/2025/16026/'
+
+
+class StaffUser:
+    pk = 1
+    is_authenticated = True
+    is_active = True
+    is_staff = True
+
+
+@pytest.fixture
+def form_lookup(monkeypatch):
+    form = {'form_name': '1040', 'data': synthetic_data('1040')}
+    monkeypatch.setattr(views.TaxpayerFormPDFView, 'get_form', lambda self, *args: form, raising=False)
+
+
+def _request(user):
+    request = RequestFactory().get(URL)
+    request.user = user
+    request._dont_enforce_csrf_checks = True
+    return request
+
+
+def test_anonymous_is_rejected_like_sync_view(form_lookup):
+    async_response = asyncio.run(
+        views.TaxpayerFormPDFAsyncView.as_view()(_request(AnonymousUser()), taxpayer_id=40, year=2025, pk=16026)
+    )
+    sync_response = views.TaxpayerFormPDFView.as_view()(_request(AnonymousUser()), taxpayer_id=40, year=2025, pk=16026)
+
+    assert sync_response.status_code in (401, 403)
+    assert async_response.status_code == sync_response.status_code
+
+
+def test_authenticated_request_is_prepared(form_lookup):
+    denied, prepared = views.TaxpayerFormPDFAsyncView().prepare(_request(StaffUser()), 40, 2025, 16026)
+    assert denied is None
+    user_key, form_name, data, key = prepared
+    assert (user_key, form_name) == (1, '1040')
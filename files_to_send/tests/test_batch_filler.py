@@ -0,0 +1,43 @@
+"""
+run_batch must report failures per job: a template that cannot be compiled
+or a worker that dies never aborts the whole batch
+"""
+
+import os
+
+import batch_filler
+from batch_filler import run_batch
+from benchmark_filler import synthetic_data
+
+
+class ListSink:
+    def __init__(self):
+        self.pdfs = {}
+
+    def __call__(self, job_number, form_name, pdf_bytes):
+        self.pdfs[job_number] = pdf_bytes
+        return job_number
+
+
+def _die(job_number, form_name, data, grey_out_calculated):
+    """Stands in for _fill_job: the worker process exits without a result"""
+    os._exit(1)
+
+
+def test_bad_template_in_preload_only_fails_its_jobs():
+    jobs = [('1040', synthetic_data('1040')), ('no_such_form', {})]
+    report = run_batch(jobs, ListSink(), workers=1, form_names=['1040', 'no_such_form'])
+
+    by_job = {r.job_number: r for r in report.results}
+    assert by_job[0].error is None and by_job[0].size > 0
+    assert by_job[1].error.startswith('ValueError')
+
+
+def test_broken_pool_gives_every_job_an_error_result(monkeypatch):
+    # Workers are forked, so they run the patched job function
+    monkeypatch.setattr(batch_filler, '_fill_job', _die)
+    jobs = [('1040', synthetic_data('1040')) for _ in range(4)]
+    report = run_batch(jobs, ListSink(), workers=1, form_names=['1040'], max_pending=2)
+
+    assert sorted(r.job_number for r in report.results) == [0, 1, 2, 3]
+    assert all(r.error.startswith('BrokenProcessPool') for r in report.results)
@@ -0,0 +1,33 @@
+"""
+Flattened (print mode) PDFs must be smaller than the editable fill and look the same
+"""
+
+import fitz  # PyMuPDF
+import pytest
+
+from benchmark_filler import synthetic_data
+from pdf_filler import fill_form_universal
+
+
+@pytest.mark.parametrize('profile', ['default', 'small'])
+@pytest.mark.parametrize('form_name', ['3800', '1040'])
+def test_flattened_is_smaller(form_name, profile):
+    data = synthetic_data(form_name)
+    editable = fill_form_universal(data, form_name, output_profile=profile)
+    flattened = fill_form_universal(data, form_name, output_profile=profile, flatten=True)
+
+    assert len(flattened) <= len(editable)
+
+    with fitz.open(stream=flattened, filetype='pdf') as doc:
+        assert not doc.is_form_pdf
+        assert all(not list(page.widgets()) for page in doc)
+
+
+def test_flattened_renders_like_the_filled_form():
+    data = synthetic_data('1040')
+    editable = fill_form_universal(data, '1040')
+    flattened = fill_form_universal(data, '1040', flatten=True)
+
+    with fitz.open(stream=editable, filetype='pdf') as filled, fitz.open(stream=flattened, filetype='pdf') as flat:
+        for filled_page, flat_page in zip(filled, flat):
+            assert filled_page.get_pixmap(dpi=72).samples == flat_page.get_pixmap(dpi=72).samples
@@ -0,0 +1,50 @@
+"""
+Dependency graph edges and plan_rerender()
+"""
+
+import copy
+
+import pytest
+
+from benchmark_filler import synthetic_data
+from form_dependencies import _FROM_FORM, build_dependency_graph, fill_signature, plan_rerender
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return build_dependency_graph()
+
+
+@pytest.mark.parametrize('source, target', [
+    (('schedule_b', '4'), ('1040', '2b')),
+    (('schedule_b', '6'), ('1040', '3b')),
+    (('schedule_se', '12'), ('schedule_2', '4')),
+    (('8995', '15'), ('1040', '13')),
+    (('1040', '11'), ('8880', 'Enter the amount from Form 1040 or 1040-SR, line 11')),
+])
+def test_edges(graph, source, target):
+    assert target in graph.affected([source])
+
+
+def test_from_form_with_1040_sr_alternative():
+    assert _FROM_FORM.findall("Enter the amount from Form 1040 or 1040-SR, line 18") == [('1040', '18')]
+    assert _FROM_FORM.findall("Education credits from Form 8863, line 19") == [('8863', '19')]
+
+
+def test_plan_rerenders_every_changed_form():
+    return_data = {form_name: synthetic_data(form_name) for form_name in ['1040', 'schedule_1', 'schedule_2', 'schedule_se']}
+    previous = {form_name: fill_signature(form_name, data) for form_name, data in return_data.items()}
+
+    # Recalculated return: Schedule 2 line 4 and Schedule 1 line 15 follow Schedule SE,
+    # and a 1040 total moved through a flow the graph does not model
+    current = copy.deepcopy(return_data)
+    current['schedule_se']['fields']['12']['value'] = '1234'
+    current['schedule_2']['fields']['4']['value'] = '1234'
+    current['1040']['fields']['24']['value'] = '98765'
+
+    plan = plan_rerender([('schedule_se', '12')], current, previous)
+
+    assert plan.forms == ['1040', 'schedule_2', 'schedule_se']
+    assert plan.unlinked == ['1040']
+    assert 'schedule_1' in plan.unchanged
+    assert set(plan.signatures) == set(plan.forms)
@@ -0,0 +1,37 @@
+"""
+NeedAppearances mode: every template must fill without generating appearances
+"""
+
+import fitz  # PyMuPDF
+import pytest
+
+from benchmark_filler import synthetic_data
+from form_mappings_complete import ALL_FORM_MAPPINGS, FORM_TEMPLATES
+from pdf_filler import fill_form_universal, generate_return_packet
+
+FORMS = [form_name for form_name in FORM_TEMPLATES if form_name in ALL_FORM_MAPPINGS]
+
+
+def _need_appearances(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+        return doc.need_appearances()
+
+
+def _filled_values(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+        return [w.field_value for page in doc for w in page.widgets() if w.field_value not in (None, '', 'Off')]
+
+
+@pytest.mark.parametrize('form_name', FORMS)
+def test_fill_each_template(form_name):
+    pdf_bytes, report = fill_form_universal(synthetic_data(form_name), form_name, need_appearances=True,
+                                            with_report=True)
+    assert _need_appearances(pdf_bytes) is True
+    if report.filled or report.taxpayer:
+        assert _filled_values(pdf_bytes)
+
+
+def test_return_packet():
+    forms = [{'form_name': form_name, 'data': synthetic_data(form_name)} for form_name in ('1040', 'schedule_1', 'schedule_c')]
+    pdf_bytes = generate_return_packet(forms, need_appearances=True)
+    assert _need_appearances(pdf_bytes) is True
@@ -0,0 +1,76 @@
+"""
+patch_filled_pdf() must produce the same widgets as a fresh full fill
+"""
+
+import copy
+
+import fitz  # PyMuPDF
+import pytest
+
+from benchmark_filler import synthetic_data
+from form_mappings_complete import ALL_FORM_MAPPINGS
+from pdf_filler import fill_form_incremental, fill_form_universal, patch_filled_pdf
+
+FORMS = ['1040', 'schedule_1', 'schedule_c', '8812']
+
+
+def _widgets(pdf_bytes):
+    """name → (value, read-only, background) of every widget"""
+    with fitz.open(stream=bytes(pdf_bytes), filetype='pdf') as doc:
+        return {
+            (page.number, widget.xref): (
+                widget.field_value or '',
+                bool(widget.field_flags & fitz.PDF_FIELD_IS_READ_ONLY),
+                tuple(widget.fill_color) if widget.fill_color else None,
+            )
+            for page in doc for widget in page.widgets()
+        }
+
+
+def _edit(data, form_name):
+    """Remove a filled value, make a calculated field editable and an editable one calculated"""
+    new_data = copy.deepcopy(data)
+    keys = list(ALL_FORM_MAPPINGS[form_name])
+    calculated = [key for key in keys if not new_data['fields'][key]['can_be_modified']]
+    editable = [key for key in keys if new_data['fields'][key]['can_be_modified']]
+
+    del new_data['fields'][editable[0]]
+    new_data['fields'][calculated[0]]['can_be_modified'] = True
+    new_data['fields'][editable[1]]['can_be_modified'] = False
+    new_data['fields'][editable[2]]['value'] = '424242'
+    return new_data
+
+
+@pytest.mark.parametrize('incremental', [False, True], ids=['full', 'incremental'])
+@pytest.mark.parametrize('form_name', FORMS)
+def test_patch_matches_full_fill(form_name, incremental):
+    old_data = synthetic_data(form_name)
+    new_data = _edit(old_data, form_name)
+
+    if incremental:
+        previous = fill_form_incremental(old_data, form_name).tobytes()
+    else:
+        previous = fill_form_universal(old_data, form_name)
+
+    patched = patch_filled_pdf(previous, old_data, new_data, form_name)
+    # Patched in place, not refilled
+    assert len(patched.prefix) > 0
+    assert len(patched.tail) > 0
+
+    assert _widgets(patched.tobytes()) == _widgets(fill_form_universal(new_data, form_name))
+
+
+@pytest.mark.parametrize('profile', ['small', 'archive'])
+@pytest.mark.parametrize('form_name', ['1040', '3800'])
+@pytest.mark.parametrize('pass_profile', [True, False], ids=['profile-given', 'profile-unknown'])
+def test_patch_renumbered_output_falls_back_to_full_fill(form_name, profile, pass_profile):
+    old_data = synthetic_data(form_name)
+    new_data = _edit(old_data, form_name)
+    previous = fill_form_universal(old_data, form_name, output_profile=profile)
+
+    options = {'output_profile': profile} if pass_profile else {}
+    patched = patch_filled_pdf(previous, old_data, new_data, form_name, **options)
+
+    # Renumbered objects: nothing may be written in place
+    assert patched.prefix == b''
+    assert _widgets(patched.tobytes()) == _widgets(fill_form_universal(new_data, form_name, **options))
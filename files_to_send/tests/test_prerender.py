@@ -0,0 +1,55 @@
+"""
+Pre-rendering must cache every form of a save, not just the first per_user
+"""
+
+import time
+
+import pytest
+
+import prerender
+import render_pool
+from benchmark_filler import synthetic_data
+from pdf_cache import MemoryPDFCache, get_pdf_cache, set_pdf_cache
+from pdf_filler import filled_pdf_key
+
+FORMS = ['1040', 'schedule_1', 'schedule_c', '8812']
+
+
+@pytest.fixture
+def pool_and_cache(monkeypatch):
+    previous_cache = get_pdf_cache()
+    cache = MemoryPDFCache()
+    set_pdf_cache(cache)
+    pool = render_pool.RenderPool(workers=1, queue=1, per_user=2)
+    monkeypatch.setattr(prerender, 'get_render_pool', lambda: pool)
+    yield pool, cache
+    pool.shutdown()
+    set_pdf_cache(previous_cache)
+
+
+def test_every_form_of_a_save_is_cached(pool_and_cache):
+    pool, cache = pool_and_cache
+    forms = [{'form_name': name, 'data': synthetic_data(name)} for name in FORMS]
+    backend = prerender.RenderPoolBackend(concurrency=1)
+
+    # More forms than the pre-render limit and the pool's queue depth
+    backend.enqueue(forms)
+
+    deadline = time.monotonic() + 120
+    keys = [filled_pdf_key(form) for form in forms]
+    while time.monotonic() < deadline and any(cache.get(key) is None for key in keys):
+        time.sleep(0.1)
+
+    assert all(cache.get(key) is not None for key in keys)
+    assert backend.pending() == 0
+
+
+def test_full_backlog_drop_is_a_warning(pool_and_cache, caplog):
+    pool, cache = pool_and_cache
+    forms = [{'form_name': name, 'data': synthetic_data(name)} for name in FORMS]
+    backend = prerender.RenderPoolBackend(concurrency=1, backlog=0)
+
+    with caplog.at_level('WARNING', logger='pdf_filler'):
+        backend.enqueue(forms)
+
+    assert any(record.levelname == 'WARNING' and 'dropped' in record.message for record in caplog.records)
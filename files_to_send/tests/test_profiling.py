@@ -0,0 +1,70 @@
+"""
+Per-request profiling: render pool fills, DRF-authenticated staff, unique dumps
+"""
+
+import pytest
+
+django = pytest.importorskip('django')
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+import render_pool
+from benchmark_filler import synthetic_data
+from fill_report import FillReport, emit_report
+from profiling import PDFProfilingMiddleware, profile_fills
+
+
+class StaffUser:
+    is_staff = True
+
+
+class AnonymousUser:
+    is_staff = False
+
+
+def test_render_pool_fills_are_collected():
+    pool = render_pool.RenderPool(workers=1)
+    try:
+        with profile_fills() as session:
+            pdf_bytes = pool.submit('user', synthetic_data('8812'), '8812').result()
+    finally:
+        pool.shutdown()
+
+    assert pdf_bytes.startswith(b'%PDF-')
+    assert [report.form_name for report in session.reports] == ['8812']
+    assert session.reports[0].timings
+
+
+def _view_authenticating_as(user):
+    """Stands in for a DRF view: the user is set while the view runs"""
+    def view(request):
+        request.user = user
+        emit_report(FillReport('1040'))
+        return HttpResponse()
+    return view
+
+
+@pytest.mark.parametrize('user, profiled', [(StaffUser(), True), (AnonymousUser(), False)])
+def test_staff_check_after_view_authentication(tmp_path, user, profiled):
+    middleware = PDFProfilingMiddleware(_view_authenticating_as(user))
+    middleware.dump_dir = str(tmp_path)
+    request = RequestFactory().get('/', HTTP_X_PDF_PROFILE='cprofile')
+    request.user = AnonymousUser()
+
+    response = middleware(request)
+
+    assert response.has_header('Server-Timing') is profiled
+    assert response.has_header('X-PDF-Profile-Dump') is profiled
+    assert len(list(tmp_path.iterdir())) == (1 if profiled else 0)
+
+
+def test_dumps_in_the_same_second_do_not_overwrite(tmp_path):
+    paths = []
+    for _ in range(3):
+        with profile_fills(str(tmp_path)) as session:
+            pass
+        paths.append(session.dump_path)
+
+    assert len(set(paths)) == 3
+    assert len(list(tmp_path.iterdir())) == 3
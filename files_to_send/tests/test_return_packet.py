@@ -0,0 +1,40 @@
+"""
+Return packets: every merged field keeps its form's name, prefixed, and
+insert_pdf() never appends its " [xref]" de-duplication suffix
+"""
+
+import fitz  # PyMuPDF
+
+from benchmark_filler import synthetic_data
+from pdf_filler import fill_form_universal, generate_return_packet
+
+# Two Schedule C: the second copy is prefixed "schedule_c_2_"
+FORMS = ['1040', 'schedule_1', 'schedule_c', 'schedule_c', '8863']
+PREFIXES = ['1040_', 'schedule_1_', 'schedule_c_', 'schedule_c_2_', '8863_']
+
+
+def _widgets(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+        return [(w.field_name, w.field_type, w.field_value, w.field_flags) for page in doc for w in page.widgets()]
+
+
+def test_merged_field_names_are_prefixed_without_suffix():
+    forms = [{'form_name': form_name, 'data': synthetic_data(form_name)} for form_name in FORMS]
+    names = [name for name, *_ in _widgets(generate_return_packet(forms))]
+
+    assert names
+    assert not [name for name in names if ' [' in name]
+    assert not [name for name in names if not name.startswith(tuple(PREFIXES))]
+    assert len(set(names)) == len(names)
+    for prefix in PREFIXES:
+        assert any(name.startswith(f"{prefix}topmostSubform[0].") for name in names)
+
+
+def test_merged_fields_match_single_form_fills():
+    forms = [{'form_name': form_name, 'data': synthetic_data(form_name)} for form_name in FORMS]
+    packet = set(_widgets(generate_return_packet(forms)))
+
+    for form in forms[:3]:
+        single = _widgets(fill_form_universal(form['data'], form['form_name']))
+        expected = {(f"{form['form_name']}_{name}", *rest) for name, *rest in single}
+        assert expected <= packet
@@ -0,0 +1,58 @@
+"""
+generate_form_pdf_stream() must not hold a second full copy of the PDF for the cache
+"""
+
+import io
+
+import pytest
+
+from benchmark_filler import synthetic_data
+from pdf_cache import DiskPDFCache, MemoryPDFCache, get_pdf_cache, set_pdf_cache
+from pdf_filler import filled_pdf_key, generate_form_pdf_stream
+
+FORM = {'form_name': '8812', 'data': synthetic_data('8812')}
+
+
+@pytest.fixture
+def use_cache():
+    previous = get_pdf_cache()
+    yield set_pdf_cache
+    set_pdf_cache(previous)
+
+
+class SetFileOnlyDiskCache(DiskPDFCache):
+    def set(self, key, pdf_bytes):
+        raise AssertionError("stream must be copied with set_file()")
+
+
+def test_memory_cache_serves_the_cached_bytes(use_cache):
+    cache = MemoryPDFCache()
+    use_cache(cache)
+
+    body = generate_form_pdf_stream(FORM)
+
+    assert isinstance(body, io.BytesIO)
+    cached = cache.get(filled_pdf_key(FORM))
+    assert body.read() == cached
+
+
+def test_memory_cache_skips_large_entries(use_cache):
+    cache = MemoryPDFCache(max_bytes=64 * 1024 * 1024, max_entry_bytes=1024)
+    use_cache(cache)
+
+    body = generate_form_pdf_stream(FORM)
+
+    assert cache.size == 0
+    assert body.read(5) == b'%PDF-'
+
+
+def test_disk_cache_copies_the_spool(use_cache, tmp_path):
+    cache = SetFileOnlyDiskCache(str(tmp_path))
+    use_cache(cache)
+
+    body = generate_form_pdf_stream(FORM, max_memory=1024)
+    pdf_bytes = body.read()
+    body.close()
+
+    assert pdf_bytes.startswith(b'%PDF-')
+    assert cache.get(filled_pdf_key(FORM)) == pdf_bytes
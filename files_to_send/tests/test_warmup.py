@@ -0,0 +1,27 @@
+"""
+start_warmup() must finish before it returns (no PyMuPDF work on a second thread)
+"""
+
+import threading
+
+import warmup
+
+
+def test_start_warmup_is_synchronous(caplog):
+    threads = threading.active_count()
+    with caplog.at_level('INFO', logger='pdf_filler'):
+        warmup.start_warmup()
+
+    assert warmup.is_ready()
+    assert threading.active_count() == threads
+    assert any('warmed up' in record.message for record in caplog.records)
+
+
+def test_start_warmup_logs_failures(monkeypatch, caplog):
+    monkeypatch.setattr(warmup, 'TEMPLATE_DIR', '/nonexistent')
+    warmup.start_warmup()
+
+    state = warmup.readiness()
+    assert not state['ready']
+    assert 'FileNotFoundError' in state['error']
+    assert any(record.levelname == 'ERROR' for record in caplog.records)
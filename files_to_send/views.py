@@ -9,15 +9,25 @@ REPLACE the existing TaxpayerFormRenderView class with the code below
 ADD the TaxpayerFormPDFView class (it's new)
 """
 
+import asyncio
 import os
-from django.http import HttpResponse
+from asgiref.sync import sync_to_async
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
 from django.shortcuts import redirect
+from django.views import View
 from rest_framework import views
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from rest_framework.renderers import TemplateHTMLRenderer
 
 # Import PDF filler utility (pdf_filler.py should be in the SAME directory as views.py)
-from .pdf_filler import generate_form_pdf
+from .pdf_filler import (
+    filled_pdf_key, form_name_and_data, generate_form_pdf_stream, generate_return_packet,
+    open_pdf_spool,
+)
+from .pdf_cache import get_pdf_cache
+from .render_pool import RenderPoolSaturated, get_render_pool
+from .warmup import readiness
 
 
 class TaxpayerFormPDFView(views.APIView):
@@ -27,6 +37,15 @@ class TaxpayerFormPDFView(views.APIView):
     Endpoint: /api/v1/taxpayer/{taxpayer_id}/render/pdf/{year}/{pk}/
     
     This replaces the old PDF generation that created flat/non-editable PDFs
+    
+    Filled PDFs are cached by content (see pdf_cache.py) and served with an
+    ETag, so a reviewer re-opening an unchanged form gets a 304. The PDF is
+    streamed from a spooled buffer (memory up to PDF_STREAM_MAX_MEMORY,
+    then a temporary file) instead of being held as one bytes object
+    
+    ?mode=print returns a FLATTENED PDF instead: values burned into the
+    pages, no form fields, subset fonts - smaller and much faster to open
+    in browser viewers, for read-only review and archiving
     """
     
     def get(self, request, taxpayer_id, year, pk):
@@ -39,18 +58,35 @@ class TaxpayerFormPDFView(views.APIView):
             pk: Form ID (16026 for Form 1040, etc.)
         
         Returns:
-            HttpResponse with PDF content
+            HttpResponse with PDF content (or 304 if the client copy is current)
         """
         try:
             # Get form instance from database
             form_instance = self.get_form(request, taxpayer_id, year, pk)
             
-            # Generate editable PDF using PyMuPDF
-            pdf_bytes = generate_form_pdf(form_instance)
+            # Print mode: flattened, read-only copy
+            flatten = request.GET.get('mode') == 'print'
             
-            # Return PDF response
-            response = HttpResponse(pdf_bytes, content_type='application/pdf')
-            response['Content-Disposition'] = f'inline; filename="Form_{pk}_{year}.pdf"'
+            # Same data + template + mappings → same key → same PDF
+            key = filled_pdf_key(form_instance, flatten=flatten)
+            etag = f'"{key}"'
+            
+            if etag in request.headers.get('If-None-Match', ''):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+            
+            # Generate editable PDF using PyMuPDF (or reuse the cached one)
+            pdf_stream = generate_form_pdf_stream(form_instance, key=key, flatten=flatten)
+            
+            # Stream PDF response (FileResponse closes the buffer when done)
+            response = FileResponse(
+                pdf_stream,
+                content_type='application/pdf',
+                filename=f"Form_{pk}_{year}{'_print' if flatten else ''}.pdf",
+            )
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
             
             return response
             
@@ -100,6 +136,199 @@ class TaxpayerFormPDFView(views.APIView):
         raise NotImplementedError("Please implement get_form() method")
 
 
+class TaxpayerFormPDFAsyncView(View):
+    """
+    Async variant of TaxpayerFormPDFView (needs an ASGI server)
+    
+    Endpoint: /api/v1/taxpayer/{taxpayer_id}/render/pdf-async/{year}/{pk}/
+    
+    The fill runs in the bounded render pool (render_pool.py), so a burst of
+    PDF requests cannot pin the server's workers. When the pool or the
+    user's share of it is full, the view answers 503 + Retry-After at once.
+    Uses TaxpayerFormPDFView for authentication, permissions and throttling
+    (same 401/403/429 responses as the sync view) and for get_form().
+    """
+    
+    async def get(self, request, taxpayer_id, year, pk):
+        try:
+            # Auth + database + session access stay synchronous
+            denied, prepared = await sync_to_async(self.prepare)(request, taxpayer_id, year, pk)
+            if denied is not None:
+                return denied
+            user_key, form_name, data, key = prepared
+            etag = f'"{key}"'
+            
+            if etag in request.headers.get('If-None-Match', ''):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+            
+            cache = get_pdf_cache()
+            pdf_bytes = cache.get(key) if cache is not None else None
+            
+            if pdf_bytes is None:
+                future = get_render_pool().submit(user_key, data, form_name)
+                pdf_bytes = await asyncio.wrap_future(future)
+                if cache is not None:
+                    cache.set(key, pdf_bytes)
+            
+            response = HttpResponse(pdf_bytes, content_type='application/pdf')
+            response['Content-Disposition'] = f'inline; filename="Form_{pk}_{year}.pdf"'
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            
+            return response
+            
+        except RenderPoolSaturated as e:
+            response = HttpResponse(
+                f'PDF generation is busy ({e.reason}). Please retry.',
+                status=503
+            )
+            response['Retry-After'] = str(e.retry_after)
+            return response
+        except FileNotFoundError as e:
+            return HttpResponse(
+                f'Error: PDF template not found. {str(e)}',
+                status=500
+            )
+        except ValueError as e:
+            return HttpResponse(
+                f'Error: Invalid form data. {str(e)}',
+                status=400
+            )
+        except Exception as e:
+            return HttpResponse(
+                f'Error generating PDF: {str(e)}',
+                status=500
+            )
+    
+    def prepare(self, request, taxpayer_id, year, pk):
+        """
+        Check access, load the form and resolve everything the async path needs (sync)
+        
+        Returns:
+            (rendered error response, None) when DRF rejects the request,
+            else (None, (user_key, form_name, data, key))
+        """
+        kwargs = {'taxpayer_id': taxpayer_id, 'year': year, 'pk': pk}
+        
+        # Run TaxpayerFormPDFView's authentication_classes, permission_classes
+        # and throttles exactly as its dispatch() would
+        api_view = TaxpayerFormPDFView()
+        api_view.args = ()
+        api_view.kwargs = kwargs
+        drf_request = api_view.initialize_request(request, **kwargs)
+        api_view.request = drf_request
+        api_view.headers = api_view.default_response_headers
+        try:
+            api_view.initial(drf_request, **kwargs)
+        except APIException as exc:
+            response = api_view.finalize_response(drf_request, api_view.handle_exception(exc), **kwargs)
+            return response.render(), None
+        
+        form_instance = api_view.get_form(drf_request, taxpayer_id, year, pk)
+        form_name, data = form_name_and_data(form_instance)
+        
+        user = drf_request.user
+        user_key = user.pk if user.is_authenticated else request.META.get('REMOTE_ADDR')
+        
+        return None, (user_key, form_name, data, filled_pdf_key(form_instance))
+
+
+class TaxpayerReturnPacketPDFView(views.APIView):
+    """
+    Generate ONE editable PDF with every form of a taxpayer's return
+    
+    Endpoint: /api/v1/taxpayer/{taxpayer_id}/render/packet/{year}/
+    
+    Replaces a dozen TaxpayerFormPDFView round trips (1040, Schedules 1/2/3,
+    A/B/C/D/E/SE, 8812, 8863...) with a single request and a single PDF
+    """
+    
+    def get(self, request, taxpayer_id, year):
+        """
+        Generate and return the merged return packet
+        
+        Args:
+            taxpayer_id: ID of the taxpayer (40, 41, 42, etc.)
+            year: Tax year (2025)
+        
+        Returns:
+            HttpResponse with PDF content
+        """
+        try:
+            # Get all form instances of this return from database
+            form_instances = self.get_forms(request, taxpayer_id, year)
+            
+            # Fill every form and merge them (serialized once, into a spooled buffer)
+            pdf_stream = generate_return_packet(form_instances, output=open_pdf_spool())
+            pdf_stream.seek(0)
+            
+            # Stream PDF response (FileResponse closes the buffer when done)
+            return FileResponse(
+                pdf_stream,
+                content_type='application/pdf',
+                filename=f"Return_{taxpayer_id}_{year}.pdf",
+            )
+            
+        except FileNotFoundError as e:
+            return HttpResponse(
+                f'Error: PDF template not found. {str(e)}',
+                status=500
+            )
+        except ValueError as e:
+            return HttpResponse(
+                f'Error: Invalid form data. {str(e)}',
+                status=400
+            )
+        except Exception as e:
+            return HttpResponse(
+                f'Error generating PDF: {str(e)}',
+                status=500
+            )
+    
+    def get_forms(self, request, taxpayer_id, year):
+        """
+        Get all form instances of the return from database
+        
+        TODO: Replace with your actual database query
+        
+        Example implementation:
+        ```
+        from .models import Form
+        return Form.objects.filter(
+            year=year,
+            taxpayer_id=taxpayer_id
+        )
+        ```
+        
+        Every returned object must look like TaxpayerFormPDFView.get_form()'s
+        (id, name, data). Forms are ordered 1040 → schedules → other forms.
+        """
+        # TODO: Implement your database query here
+        # For now, this is a placeholder
+        raise NotImplementedError("Please implement get_forms() method")
+
+
+class PDFFillerReadyView(views.APIView):
+    """
+    Readiness probe for the load balancer
+    
+    Endpoint: /api/v1/health/pdf-filler/
+    
+    200 once warmup.start_warmup() (called from AppConfig.ready()) has
+    loaded every template and fill plan in this worker, 503 until then or
+    when it failed
+    """
+    
+    authentication_classes = []
+    permission_classes = []
+    
+    def get(self, request):
+        state = readiness()
+        return Response(state, status=200 if state['ready'] else 503)
+
+
 class TaxpayerFormRenderView(views.APIView):
     """
     Redirect HTML form view to PDF view
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup Warm-up for the PDF Filler
+Loads every template before the first request so no fill pays cold-start costs
+
+ARCHITECTURE:
+- Validates TEMPLATE_DIR and that every FORM_TEMPLATES file exists
+- Loads every template into the shared byte store (template_store.py)
+- Builds/loads every widget index and compiles every fill plan
+- Exposes readiness (is_ready() / readiness()) for the load balancer probe
+- Runs SYNCHRONOUSLY in the worker before it serves requests: PyMuPDF is
+  not thread-safe, so a warm-up thread must never build widget indexes
+  while request threads fill PDFs
+
+USAGE (your app's apps.py):
+    class TaxAppConfig(AppConfig):
+        def ready(self):
+            from .warmup import start_warmup
+            start_warmup()            # blocks until every template is loaded
+
+    Route PDFFillerReadyView (views.py) as the readiness probe: it answers
+    200 once the warm-up finished, 503 if it failed.
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import logging
+import os
+import threading
+import time
+
+try:
+    from .pdf_filler import TEMPLATE_DIR, compile_fill_plans, get_template_path
+    from .form_mappings_complete import FORM_TEMPLATES
+    from .template_store import get_template_blob
+except ImportError:
+    # Standalone mode (not in Django)
+    from pdf_filler import TEMPLATE_DIR, compile_fill_plans, get_template_path
+    from form_mappings_complete import FORM_TEMPLATES
+    from template_store import get_template_blob
+
+logger = logging.getLogger('pdf_filler')
+
+# Warm-up state (one per worker process)
+_STATE = {
+    'ready': False,
+    'started_at': None,
+    'finished_at': None,
+    'forms': 0,
+    'problems': 0,
+    'error': None,
+}
+_WARMUP_LOCK = threading.Lock()
+
+
+def warm_up(strict=False):
+    """
+    Load every template, widget index and fill plan (blocking)
+
+    Args:
+        strict (bool): Treat mapping problems as a failed warm-up
+
+    Raises:
+        FileNotFoundError: TEMPLATE_DIR or a template file is missing
+        ValueError: Mapping problems found with strict=True
+    """
+    with _WARMUP_LOCK:
+        _STATE.update(ready=False, started_at=time.time(), finished_at=None, error=None)
+        try:
+            if not os.path.isdir(TEMPLATE_DIR):
+                raise FileNotFoundError(f"TEMPLATE_DIR not found: {TEMPLATE_DIR}")
+
+            for form_name in FORM_TEMPLATES:
+                get_template_blob(get_template_path(form_name))
+
+            problems = compile_fill_plans(strict=strict)
+        except Exception as e:
+            _STATE['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _STATE['finished_at'] = time.time()
+
+        _STATE.update(
+            ready=True,
+            forms=len(FORM_TEMPLATES),
+            problems=sum(len(form_problems) for form_problems in problems.values()),
+        )
+
+    logger.info("PDF filler warmed up: %d forms in %.1fs",
+                _STATE['forms'], _STATE['finished_at'] - _STATE['started_at'])
+    if _STATE['problems']:
+        logger.warning("%d mapping problems (see compile_fill_plans())", _STATE['problems'])
+
+
+def start_warmup(strict=False):
+    """
+    Warm up from AppConfig.ready(), before the worker serves requests
+
+    A failure is logged instead of raised so the worker still starts; the
+    readiness probe then reports 503 with the error.
+
+    Args:
+        strict (bool): See warm_up()
+    """
+    try:
+        warm_up(strict)
+    except Exception:
+        logger.exception("PDF filler warm-up failed")
+
+
+def is_ready():
+    return _STATE['ready']
+
+
+def readiness():
+    """Copy of the warm-up state (for the readiness view / health checks)"""
+    return dict(_STATE)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Batched Widget Writes for the PDF Filler
+Collects every property change per widget and commits each widget ONCE
+
+ARCHITECTURE:
+- Input: Writes from the fill plan (value, read-only + grey, checkbox state)
+- Process: Merges all writes that target the same widget (later value wins,
+  greying sticks - same result as the old write-then-update sequence)
+- Output: One widget.update() per widget, or - in NeedAppearances mode -
+  raw /V, /AS, /Ff and /MK edits with NO appearance streams generated;
+  the viewer builds them when the PDF is opened
+
+FILE LOCATION: Place this file at the SAME level as pdf_filler.py
+"""
+
+import fitz  # PyMuPDF
+
+try:
+    from .template_index import BUTTON_TYPES
+except ImportError:
+    # Standalone mode (not in Django)
+    from template_index import BUTTON_TYPES
+
+# Background colour of greyed-out (calculated) fields
+GREY_FILL = (0.9, 0.9, 0.9)
+
+
+class PendingWrite:
+    """All changes queued for one widget"""
+
+    __slots__ = ('entry', 'value', 'read_only')
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.value = None
+        # True = make read-only + grey, False = make editable again, None = leave as is
+        self.read_only = None
+
+
+class WidgetWriteBatch:
+    """
+    Queue of widget writes for ONE open document
+
+    Usage:
+        batch = WidgetWriteBatch()
+        batch.set_value(entry, "75000")
+        batch.set_read_only(entry)
+        batch.commit(doc, index)        # one update() per widget
+    """
+
+    def __init__(self):
+        # xref → PendingWrite, in first-write order
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def _get(self, entry):
+        write = self.pending.get(entry.xref)
+        if write is None:
+            write = self.pending[entry.xref] = PendingWrite(entry)
+        return write
+
+    def set_value(self, entry, value):
+        """Queue a text value or checkbox state ("Off" / on-state name)"""
+        self._get(entry).value = value
+
+    def set_read_only(self, entry):
+        """Queue read-only flag + grey background"""
+        self._get(entry).read_only = True
+
+    def set_editable(self, entry):
+        """Queue removal of the read-only flag and grey background (patching a filled PDF)"""
+        self._get(entry).read_only = False
+
+    def commit(self, doc, index, need_appearances=False):
+        """
+        Apply every queued write to the document
+
+        Args:
+            doc: Open fitz.Document of the indexed template
+            index (TemplateIndex): Index the entries come from
+            need_appearances (bool): Skip appearance generation and set
+                /NeedAppearances so the viewer regenerates them instead
+        """
+        if need_appearances:
+            for write in self.pending.values():
+                _write_raw(doc, write)
+            # /AcroForm is an indirect object in the IRS templates, so the
+            # catalog path cannot be written with xref_set_key()
+            doc.need_appearances(True)
+        else:
+            # Keep page references alive while widgets are written
+            # (avoids "not bound to page" error)
+            pages = {}
+            for write in self.pending.values():
+                if write.value == '' or write.read_only is False:
+                    # Widget.update() ignores an empty value and a None fill
+                    # colour, so clears are written to the dictionary first;
+                    # update() below then rebuilds the appearance from it
+                    _write_raw(doc, write)
+                widget = index.load_widget(doc, write.entry, pages)
+                if write.value:
+                    widget.field_value = write.value
+                if write.read_only:
+                    widget.field_flags |= fitz.PDF_FIELD_IS_READ_ONLY
+                    widget.fill_color = GREY_FILL
+                widget.update()
+
+        self.pending.clear()
+
+
+def _field_xref(doc, xref):
+    """Object holding the field value: the widget itself, or its parent for unnamed kids"""
+    if doc.xref_get_key(xref, "T")[0] != 'null':
+        return xref
+    kind, parent = doc.xref_get_key(xref, "Parent")
+    if kind == 'xref':
+        return int(parent.split()[0])
+    return xref
+
+
+def _write_raw(doc, write):
+    """Write one widget's dictionary keys directly (no appearance stream)"""
+    xref = write.entry.xref
+    field_xref = _field_xref(doc, xref)
+
+    if write.value is not None:
+        if write.entry.field_type in BUTTON_TYPES:
+            doc.xref_set_key(field_xref, "V", f"/{write.value}")
+            doc.xref_set_key(xref, "AS", f"/{write.value}")
+        else:
+            doc.xref_set_key(field_xref, "V", fitz.get_pdf_str(write.value))
+
+    if write.read_only is not None:
+        kind, flags = doc.xref_get_key(field_xref, "Ff")
+        flags = int(flags) if kind == 'int' else 0
+        if write.read_only:
+            doc.xref_set_key(field_xref, "Ff", str(flags | fitz.PDF_FIELD_IS_READ_ONLY))
+            doc.xref_set_key(xref, "MK/BG", "[%g %g %g]" % GREY_FILL)
+        else:
+            doc.xref_set_key(field_xref, "Ff", str(flags & ~fitz.PDF_FIELD_IS_READ_ONLY))
+            doc.xref_set_key(xref, "MK/BG", "null")
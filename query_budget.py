@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL run inside the block: `with count_queries() as queries: ...`"""
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        yield queries
+
+
+def query_budget(template_name):
+    """
+    Queries allowed while rendering a template.
+
+    settings.FORM_RENDER_QUERY_BUDGETS maps template names to budgets,
+    settings.FORM_RENDER_QUERY_BUDGET is the default (0: the view prefetches
+    everything the form templates read).
+    """
+    budgets = getattr(settings, "FORM_RENDER_QUERY_BUDGETS", {})
+    if template_name in budgets:
+        return budgets[template_name]
+    return getattr(settings, "FORM_RENDER_QUERY_BUDGET", 0)
+
+
+def assert_query_budget(template_name, queries):
+    """Raise QueryBudgetExceeded when rendering a template ran more queries than its budget (tests)."""
+    budget = query_budget(template_name)
+    if len(queries) > budget:
+        raise QueryBudgetExceeded(
+            f"Rendering {template_name} ran {len(queries)} queries (budget {budget}):\n" + "\n".join(queries)
+        )
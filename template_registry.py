@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FORMS_DIR = "forms"
+GENERIC_FORM_TEMPLATE = "forms/form.html"
+DEFAULT_FORM_TEMPLATE = "forms/form_1040.html"
+
+
+def normalize_form_name(name):
+    return name.lower().replace(" ", "_")
+
+
+class FormTemplateRegistry:
+    """
+    Form name -> template path, built from one scan of templates/forms/.
+
+    Resolution is a dict lookup. In DEBUG the directory mtime is checked on
+    lookup and the scan is redone when templates are added or removed.
+    """
+
+    def __init__(self, templates_dir=None, auto_refresh=None):
+        self.templates_dir = templates_dir or os.path.join(settings.BASE_DIR, "templates")
+        self.auto_refresh = settings.DEBUG if auto_refresh is None else auto_refresh
+        self._lock = threading.Lock()
+        self._templates = {}
+        self._fallback = DEFAULT_FORM_TEMPLATE
+        self._mtime = None
+        self._unknown = set()
+        self.scan()
+
+    def _forms_dir_mtime(self):
+        try:
+            return os.stat(os.path.join(self.templates_dir, FORMS_DIR)).st_mtime
+        except OSError:
+            return None
+
+    def scan(self):
+        forms_dir = os.path.join(self.templates_dir, FORMS_DIR)
+        mtime = self._forms_dir_mtime()
+        try:
+            file_names = os.listdir(forms_dir)
+        except OSError:
+            file_names = []
+
+        templates = {
+            file_name[: -len(".html")]: f"{FORMS_DIR}/{file_name}"
+            for file_name in file_names
+            if file_name.endswith(".html")
+        }
+        fallback = GENERIC_FORM_TEMPLATE if GENERIC_FORM_TEMPLATE in templates.values() else DEFAULT_FORM_TEMPLATE
+
+        with self._lock:
+            self._templates = templates
+            self._fallback = fallback
+            self._mtime = mtime
+            self._unknown = set()
+
+    def templates(self):
+        """Form name -> template path of every registered form template."""
+        if self.auto_refresh and self._forms_dir_mtime() != self._mtime:
+            self.scan()
+        return dict(self._templates)
+
+    def resolve(self, form_name):
+        if self.auto_refresh and self._forms_dir_mtime() != self._mtime:
+            self.scan()
+
+        name = normalize_form_name(form_name)
+        template_path = self._templates.get(name)
+        if template_path is not None:
+            return template_path
+
+        if name not in self._unknown:
+            with self._lock:
+                self._unknown.add(name)
+            logger.warning("No template for form %r, rendering with %s", form_name, self._fallback)
+        return self._fallback
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = FormTemplateRegistry()
+    return _registry
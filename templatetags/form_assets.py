@@ -0,0 +1,24 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.safestring import mark_safe
+
+from ..assets import asset_path, inline_css
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle_url(name):
+    """URL of a content-hashed bundle or stylesheet built by assets.py: {% bundle_url 'irs_forms' %}"""
+    return static(asset_path(name))
+
+
+@register.simple_tag
+def inline_static(path):
+    """
+    Minified stylesheet content for a <style> block, from an in-memory cache.
+
+    Load this library after custom_filters so it replaces that library's
+    filesystem-reading inline_static: {% load static custom_filters form_assets %}
+    """
+    return mark_safe(inline_css(path))
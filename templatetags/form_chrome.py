@@ -0,0 +1,59 @@
+import threading
+
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+# (template name, fragment name, *vary_on) -> rendered SafeString
+_fragments = {}
+_fragments_lock = threading.Lock()
+MAX_FRAGMENTS = 2048
+
+
+def clear_static_fragments():
+    with _fragments_lock:
+        _fragments.clear()
+
+
+class StaticFragmentNode(template.Node):
+    def __init__(self, nodelist, fragment_name, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        if settings.DEBUG:
+            return self.nodelist.render(context)
+
+        template_name = context.template.name if context.template else None
+        key = (template_name, self.fragment_name) + tuple(str(var.resolve(context)) for var in self.vary_on)
+        rendered = _fragments.get(key)
+        if rendered is None:
+            rendered = self.nodelist.render(context)
+            with _fragments_lock:
+                if len(_fragments) >= MAX_FRAGMENTS:
+                    _fragments.clear()
+                _fragments[key] = rendered
+        return rendered
+
+
+@register.tag
+def static_fragment(parser, token):
+    """
+    Render a block once per (template, name, *vary_on) and reuse the HTML.
+
+        {% static_fragment 'page1_text' year %} ...static layout... {% endstatic_fragment %}
+
+    For form chrome that does not depend on the taxpayer or the user: the
+    block, including any tags inside it, is skipped on every later render.
+    Not cached in DEBUG, so template edits show up immediately.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name")
+    nodelist = parser.parse(("endstatic_fragment",))
+    parser.delete_first_token()
+    fragment_name = bits[1].strip("'\"")
+    vary_on = [parser.compile_filter(bit) for bit in bits[2:]]
+    return StaticFragmentNode(nodelist, fragment_name, vary_on)
@@ -0,0 +1,108 @@
+import re
+from collections.abc import Mapping
+
+from django import template
+
+register = template.Library()
+
+READONLY_ATTR = " readonly"
+DISABLED_ATTR = " disabled"
+
+
+def _get(field, name, default=None):
+    if isinstance(field, Mapping):
+        return field.get(name, default)
+    return getattr(field, name, default)
+
+
+def field_alias(key):
+    """Template-safe name of a field key: 'Part I, 1' -> 'Part_I_1', 'B(i)' -> 'B_i'."""
+    return re.sub(r"\W+", "_", str(key)).strip("_")
+
+
+class FieldView:
+    """Everything a form template writes for one field, computed once per render."""
+
+    __slots__ = ("key", "field", "id", "value", "label", "readonly", "disabled", "readonly_attr", "disabled_attr")
+
+    def __init__(self, key, field, can_override):
+        self.key = key
+        self.field = field
+        self.id = _get(field, "id", key)
+        if _get(field, "ftype") == "checkbox" or not hasattr(field, "get_value"):
+            self.value = _get(field, "value")
+        else:
+            self.value = field.get_value()
+        self.label = _get(field, "label")
+        self.readonly = not _get(field, "can_be_modified", True)
+        self.disabled = self.readonly and not can_override
+        self.readonly_attr = READONLY_ATTR if self.readonly else ""
+        self.disabled_attr = DISABLED_ATTR if self.disabled else ""
+
+
+class _MissingField:
+    """Stand-in for keys the form does not have (renders as an empty, editable input)."""
+
+    id = ""
+    value = None
+    label = None
+    field = None
+    readonly = disabled = False
+    readonly_attr = disabled_attr = ""
+
+
+MISSING_FIELD = _MissingField()
+
+
+class FormFieldView(Mapping):
+    """
+    Per-render field lookup for form templates.
+
+    Wraps the map from form_fields_map. `f.<key>` (or `f.<alias>` for keys
+    that are not valid template names, see field_alias) returns a FieldView,
+    built on first access and reused for every later id/value/readonly/
+    disabled read of that field during the render.
+    """
+
+    def __init__(self, fields, can_override=False):
+        self._fields = fields or {}
+        self._can_override = can_override
+        self._views = {}
+        self._aliases = {}
+        for key in self._fields:
+            alias = field_alias(key)
+            if alias != key:
+                # Two keys collapsing to one alias: neither gets it
+                self._aliases[alias] = None if alias in self._aliases else key
+
+    def __getitem__(self, key):
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        source_key = key if key in self._fields else self._aliases.get(key)
+        if source_key is None:
+            return MISSING_FIELD
+
+        view = self._views.get(source_key)
+        if view is None:
+            view = FieldView(source_key, self._fields[source_key], self._can_override)
+            self._views[source_key] = view
+        self._views[key] = view
+        return view
+
+    def __contains__(self, key):
+        return key in self._fields or self._aliases.get(key) is not None
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+
+@register.simple_tag(takes_context=True)
+def form_field_view(context, fields):
+    """{% form_fields_map form as fields %}{% form_field_view fields as f %} ... {{ f.1a.value }}"""
+    user = context.get("user")
+    return FormFieldView(fields, can_override=bool(getattr(user, "is_superuser", False)))
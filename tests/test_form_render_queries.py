@@ -0,0 +1,54 @@
+"""
+Query budget per form template: rendering a form must not run lazy queries.
+
+Runs in the host project (`python manage.py test <app>.tests`) against its
+fixture data:
+
+    FORM_RENDER_TEST_FIXTURES = ["form_render"]          # loaded for the test
+    FORM_RENDER_TEST_CASES = [                           # one per form template
+        {"user": 1, "taxpayer_id": 40, "year": 2025, "pk": 16026},
+        ...
+    ]
+
+Budgets come from FORM_RENDER_QUERY_BUDGETS / FORM_RENDER_QUERY_BUDGET (0).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..query_budget import assert_query_budget, count_queries
+from ..template_registry import get_template_registry
+from ..views import TaxpayerFormRenderView
+
+
+class FormRenderQueryBudgetTests(TestCase):
+    fixtures = getattr(settings, "FORM_RENDER_TEST_FIXTURES", [])
+
+    def setUp(self):
+        self.cases = getattr(settings, "FORM_RENDER_TEST_CASES", [])
+        if not self.cases:
+            self.skipTest("FORM_RENDER_TEST_CASES is not set")
+
+    def render(self, case):
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=get_user_model().objects.get(pk=case["user"]))
+        response = TaxpayerFormRenderView.as_view()(
+            request, taxpayer_id=case["taxpayer_id"], year=case["year"], pk=case["pk"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with count_queries() as queries:
+            response.render()
+        return response.template_name, queries
+
+    def test_render_queries_within_budget(self):
+        for case in self.cases:
+            template_name, queries = self.render(case)
+            with self.subTest(template=template_name, form=case["pk"]):
+                assert_query_budget(template_name, queries)
+
+    def test_every_form_template_is_covered(self):
+        rendered = {self.render(case)[0] for case in self.cases}
+        missing = sorted(set(get_template_registry().templates().values()) - rendered)
+        self.assertEqual(missing, [], "Add FORM_RENDER_TEST_CASES for these templates")
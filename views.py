@@ -1,10 +1,11 @@
-import os
-
-from django.conf import settings
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import views
 from rest_framework.response import Response
 from rest_framework.renderers import TemplateHTMLRenderer
 
+from . import checks  # noqa: F401  (registers the cached template loader check)
+from .template_registry import get_template_registry
+
 
 class TaxpayerFormRenderView(views.APIView):
 
@@ -12,25 +13,27 @@ class TaxpayerFormRenderView(views.APIView):
         return [TemplateHTMLRenderer()]
 
     def get_template_path(self, form_instance):
-        template_name_base = form_instance.name.lower().replace(" ", "_")
-        template_name_path = f"forms/{template_name_base}.html"
-
-        templates_dir = os.path.join(settings.BASE_DIR, "templates")
-        full_template_path = os.path.join(templates_dir, template_name_path)
-
-        if not os.path.exists(full_template_path):
-            generic_form_template_path = "forms/form.html"
-            if os.path.exists(os.path.join(templates_dir, generic_form_template_path)):
-                template_name_path = generic_form_template_path
-            else:
-                template_name_path = "forms/form_1040.html"
-
-        return template_name_path
+        return get_template_registry().resolve(form_instance.name)
+
+    def prefetch_render_objects(self, form_instance, taxpayer, user):
+        # Everything the form templates read, loaded up front so rendering
+        # runs no lazy queries (one query per relation, not per access)
+        field_model = form_instance.field_set.model
+        prefetch_related_objects(
+            [form_instance],
+            "year",
+            Prefetch("field_set", queryset=field_model.objects.order_by("order")),
+        )
+        if taxpayer:
+            prefetch_related_objects([taxpayer], "taxpayer_spouse", "dependent_set")
+        if user.is_authenticated:
+            prefetch_related_objects([user], "user_spouse")
 
     def get(self, request, taxpayer_id, year, pk):
         form_instance = self.get_form(request, taxpayer_id, year, pk)
         template_name_path = self.get_template_path(form_instance)
         taxpayer = self.get_taxpayer(taxpayer_id)
+        self.prefetch_render_objects(form_instance, taxpayer, request.user)
 
         context = {
             "form": form_instance,